@@ -5,50 +5,169 @@ Konvertiert editierte Cytoscape.js-Graphen zurück zu NetworkX-Graphen und Neo4j
 """
 
 import json
+import sys
+import time
 import uuid
 import networkx as nx
+import numpy as np
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List, Tuple, Optional, Union
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Tuple, Optional, Union
 from dataclasses import dataclass
 
+# Optional: schnellerer JSON-Parser (json.loads akzeptiert ebenfalls bytes)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
-class CytoscapeElement:
-    """Klasse für Cytoscape.js-Elemente"""
-    
-    def __init__(self, data: Dict[str, Any], classes: str = "", position: Optional[Dict[str, float]] = None, **kwargs):
-        """Initialisiert Element und ignoriert unbekannte Felder"""
-        self.data = data
-        self.classes = classes
-        self.position = position
-        # Zusätzliche Felder ignorieren (z.B. 'group', 'selected', etc.)
-        for key, value in kwargs.items():
-            setattr(self, key, value)
-    
-    def is_node(self) -> bool:
-        """Prüft ob Element ein Knoten ist"""
-        return 'source' not in self.data and 'target' not in self.data
-    
-    def is_edge(self) -> bool:
-        """Prüft ob Element eine Kante ist"""
-        return 'source' in self.data and 'target' in self.data
+# Parametrisierte Batch-Statements (Ausführung per session.run(cypher, rows=...))
+_NODE_UNWIND_CYPHER = "UNWIND $rows AS row CREATE (n:{label}) SET n = row"
+_RELATIONSHIP_UNWIND_CYPHER = ("UNWIND $rows AS row MATCH (a {{id: row.src}}), (b {{id: row.tgt}}) "
+                               "CREATE (a)-[r:{relationship}]->(b) SET r = row.props")
+
+# Parametrisierte Einzel-Statements (Werte nur als Parameter, Plan wird gecacht)
+_NODE_MERGE_CYPHER = "MERGE (n:{label} {{id: $id}}) SET n += $props"
+_RELATIONSHIP_MERGE_CYPHER = ("MATCH (a {{id: $source}}), (b {{id: $target}}) "
+                              "MERGE (a)-[r:{relationship}]->(b) SET r += $props")
+
+# Escaping für String-Literale in Cypher (einmaliger C-Durchlauf per str.translate)
+_CYPHER_ESC = str.maketrans({'"': '\\"', '\n': '\\n', '\\': '\\\\', '\r': '\\r'})
+
+# Attribute, die nicht als Neo4j-Eigenschaften geschrieben werden
+_NODE_SKIP = frozenset({'node_type', 'classes', 'x', 'y', 'icon', 'bg_color', 'size'})
+_RELATIONSHIP_SKIP = frozenset({'relationship', 'classes', 'line_color'})
+
+# Cytoscape-Kantenfelder, die nicht als zusätzliche Kanten-Attribute übernommen werden
+_EDGE_META_SKIP = frozenset({'id', 'source', 'target', 'relationship'})
+
+# Knoten-Typen, die in Neo4j zusätzlich das Label RESOURCE tragen
+_RESOURCE_TYPES = frozenset({'ACTOR', 'OBJECT', 'KNOWLEDGE', 'BUDGET'})
+
+
+def _intern(value: Any) -> Any:
+    """Interniert Strings, damit wiederkehrende Typ-/Status-/Beziehungsnamen ein Objekt teilen"""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _is_edge(element: Dict[str, Any]) -> bool:
+    """Prüft ob Cytoscape-Element eine Kante ist (über 'group', sonst: Kanten haben immer 'source')"""
+    group = element.get('group')
+    if group is not None:
+        return group == 'edges'
+    return 'source' in element.get('data', ())
+
+
+@lru_cache(maxsize=256)
+def _label_for(node_type: str) -> str:
+    """Bestimmt Neo4j-Label für einen Knoten-Typ"""
+    upper = node_type.upper()
+    return f"RESOURCE:{upper}" if upper in _RESOURCE_TYPES else upper
+
+
+@lru_cache(maxsize=256)
+def _node_cypher_template(label: str, fields: Tuple[Tuple[str, bool], ...]) -> str:
+    """Erzeugt eine str.format-Vorlage für ein festes Knoten-Schema
+    
+    fields enthält (Schlüssel, ist_string) in Ausgabereihenfolge; die Werte werden
+    beim Formatieren positionsweise eingesetzt (Strings bereits escaped).
+    """
+    def literal(text: str) -> str:
+        return text.replace('{', '{{').replace('}', '}}')
+    
+    props = ', '.join(f'{literal(key)}: "{{}}"' if is_str else f'{literal(key)}: {{}}'
+                      for key, is_str in fields)
+    return f'CREATE (n:{literal(label)} {{{{{props}}}}})'
+
+
+def _edge_rounds(edge_rows: Dict[str, List[Dict[str, Any]]], num_threads: int,
+                 batch_size: int) -> List[List[List[Tuple[str, List[Dict[str, Any]]]]]]:
+    """Plant Kanten-Batches in Runden, deren Jobs keine gemeinsamen Knoten berühren
+    
+    Knoten werden per Hash auf 2 * num_threads Partitionen verteilt, jede Kante gehört zum
+    Partitionspaar ihrer beiden Endpunkte (eine Beziehung sperrt Quelle und Ziel). Runde 0
+    enthält die Kanten innerhalb je einer Partition, die weiteren Runden die Paare eines
+    Rundenturniers (Kreismethode): in jeder Runde ist jede Partition in höchstens einem
+    Job. Ein Job ist eine Liste von (cypher, rows), die ein Thread nacheinander ausführt.
+    """
+    num_partitions = 2 * num_threads
+    groups: Dict[Tuple[int, int], List[Tuple[str, List[Dict[str, Any]]]]] = {}
+    for relationship, rows in edge_rows.items():
+        cypher = _RELATIONSHIP_UNWIND_CYPHER.format(relationship=relationship)
+        binned: Dict[Tuple[int, int], List[Dict[str, Any]]] = {}
+        for row in rows:
+            a = hash(row['src']) % num_partitions
+            b = hash(row['tgt']) % num_partitions
+            binned.setdefault((a, b) if a <= b else (b, a), []).append(row)
+        for pair, pair_rows in binned.items():
+            jobs = groups.setdefault(pair, [])
+            for i in range(0, len(pair_rows), batch_size):
+                jobs.append((cypher, pair_rows[i:i + batch_size]))
+    
+    # Runde 0: Kanten innerhalb einer Partition; dann Paarungen der Kreismethode
+    # (Partition num_partitions - 1 fest, die übrigen rotieren)
+    pairings = [[(p, p) for p in range(num_partitions)]]
+    ring = num_partitions - 1
+    for r in range(ring):
+        pairing = [(r, ring)]
+        for i in range(1, num_partitions // 2):
+            a, b = (r + i) % ring, (r - i) % ring
+            pairing.append((a, b) if a <= b else (b, a))
+        pairings.append(pairing)
+    
+    rounds = []
+    for pairing in pairings:
+        jobs = [groups[pair] for pair in pairing if pair in groups]
+        if jobs:
+            rounds.append(jobs)
+    return rounds
 
 
 class Cytoscape2GraphConverter:
     """Konvertiert Cytoscape.js-JSON zu NetworkX-Graphen und Neo4j-Cypher-Statements"""
     
-    def __init__(self):
+    def __init__(self, lightweight: bool = False):
+        """lightweight=True: nur nodes_data/edges_data aufbauen, kein NetworkX-Graph
+        (reicht für Cypher-Export und Zusammenfassung)"""
+        self.lightweight = lightweight
         self.graph = nx.DiGraph()
         self.elements = []
         self.nodes_data = {}
         self.edges_data = {}
+        self._edge_endpoints: Dict[str, Tuple[str, str]] = {}
+        # Anzahl gestreamter Elemente; None solange nicht per Streaming geladen
+        self._streamed_elements: Optional[int] = None
+        # Cypher direkt beim Aufbau des Graphs erzeugen (nach ID, wie nodes_data/edges_data)
+        self._collect_cypher = False
+        self._node_cypher: Dict[str, str] = {}
+        self._relationship_cypher: Dict[str, str] = {}
+        # Gesammelte Knoten/Kanten für die Bulk-APIs von NetworkX
+        self._pending_nodes: List[Tuple[str, Dict[str, Any]]] = []
+        self._pending_edges: List[Tuple[str, str, Dict[str, Any]]] = []
     
-    def load_cytoscape_json(self, filepath_or_data: Union[str, List[Dict[str, Any]]]) -> bool:
-        """Lädt Cytoscape.js-JSON-Datei oder direkte Daten"""
+    def load_cytoscape_json(self, filepath_or_data: Union[str, List[Dict[str, Any]]], streaming: bool = False) -> bool:
+        """Lädt Cytoscape.js-JSON-Datei oder direkte Daten
+        
+        Mit streaming=True wird eine Datei per ijson elementweise gelesen und der
+        NetworkX-Graph direkt aufgebaut, ohne die Elementliste im Speicher zu halten.
+        """
+        self._streamed_elements = None
         try:
+            if isinstance(filepath_or_data, str) and streaming:
+                try:
+                    import ijson
+                except ImportError:
+                    print("⚠️ ijson nicht installiert - lade Datei vollständig (pip install ijson)")
+                else:
+                    return self._load_cytoscape_json_streaming(filepath_or_data, ijson)
+            
             if isinstance(filepath_or_data, str):
                 # Von Datei laden
-                with open(filepath_or_data, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(filepath_or_data, 'rb') as f:
+                    data = _json_loads(f.read())
                 
                 # Prüfe Format
                 if 'elements' in data and isinstance(data['elements'], list):
@@ -69,144 +188,357 @@ class Cytoscape2GraphConverter:
             print(f"❌ Fehler beim Laden: {e}")
             return False
     
-    def cytoscape_to_networkx(self) -> nx.DiGraph:
-        """Konvertiert Cytoscape.js-Elemente zu NetworkX-Graph"""
+    def _load_cytoscape_json_streaming(self, filepath: str, ijson) -> bool:
+        """Liest Elemente inkrementell und baut den Graph direkt auf"""
+        self.elements = []
+        self._reset_graph()
+        
+        with open(filepath, 'rb') as f:
+            # Top-Level-Array oder {"elements": [...]}
+            first = f.read(64).lstrip()[:1]
+            f.seek(0)
+            if first == b'[':
+                prefix = 'item'
+            elif first == b'{':
+                prefix = 'elements.item'
+            else:
+                print(f"❌ Unbekanntes JSON-Format in {filepath}")
+                return False
+            
+            # Knoten sofort übernehmen, nur Kanten puffern (brauchen existierende Knoten)
+            count = 0
+            edges = []
+            for element in ijson.items(f, prefix, use_float=True):
+                count += 1
+                if _is_edge(element):
+                    edges.append(element)
+                else:
+                    self._add_networkx_node(element)
+        
+        for element in edges:
+            self._add_networkx_edge(element)
+        self._flush_pending()
+        
+        self._streamed_elements = count
+        print(f"✅ {count} Cytoscape-Elemente gestreamt")
+        return True
+    
+    def _reset_graph(self):
+        """Leert Graph und abgeleitete Daten"""
         self.graph.clear()
         self.nodes_data.clear()
         self.edges_data.clear()
+        self._edge_endpoints.clear()
+        self._node_cypher.clear()
+        self._relationship_cypher.clear()
+    
+    def cytoscape_to_networkx(self) -> nx.DiGraph:
+        """Konvertiert Cytoscape.js-Elemente zu NetworkX-Graph"""
+        if self._streamed_elements is not None:
+            # Graph wurde bereits beim Streaming aufgebaut
+            return self.graph
         
-        # 1. Knoten hinzufügen
+        self._reset_graph()
+        
+        # Elemente in einem Durchlauf nach Knoten und Kanten aufteilen
+        nodes = []
+        edges = []
         for element in self.elements:
-            cyto_elem = CytoscapeElement(**element)
-            
-            if cyto_elem.is_node():
-                self._add_networkx_node(cyto_elem)
+            (edges if _is_edge(element) else nodes).append(element)
+        
+        # 1. Knoten hinzufügen (Kanten brauchen existierende Knoten)
+        for element in nodes:
+            self._add_networkx_node(element)
         
         # 2. Kanten hinzufügen
-        for element in self.elements:
-            cyto_elem = CytoscapeElement(**element)
-            
-            if cyto_elem.is_edge():
-                self._add_networkx_edge(cyto_elem)
+        for element in edges:
+            self._add_networkx_edge(element)
         
-        print(f"🔄 NetworkX-Graph erstellt: {self.graph.number_of_nodes()} Knoten, {self.graph.number_of_edges()} Kanten")
+        self._flush_pending()
+        
+        if self.lightweight:
+            print(f"🔄 Graph-Daten erstellt: {len(self.nodes_data)} Knoten, {len(self.edges_data)} Kanten")
+        else:
+            print(f"🔄 NetworkX-Graph erstellt: {self.graph.number_of_nodes()} Knoten, {self.graph.number_of_edges()} Kanten")
         return self.graph
     
-    def _add_networkx_node(self, element: CytoscapeElement):
+    def _flush_pending(self):
+        """Übernimmt gesammelte Knoten und Kanten per Bulk-API in den NetworkX-Graph"""
+        self.graph.add_nodes_from(self._pending_nodes)
+        self.graph.add_edges_from(self._pending_edges)
+        self._pending_nodes.clear()
+        self._pending_edges.clear()
+    
+    def _add_networkx_node(self, element: Dict[str, Any]):
         """Fügt Knoten zu NetworkX-Graph hinzu"""
-        node_id = element.data.get('id')
+        data = element.get('data', {})
+        node_id = data.get('id')
         if not node_id:
             node_id = str(uuid.uuid4())
         
         # Node-Attribute aufbereiten
         node_attrs = {
-            'name': element.data.get('label', element.data.get('name', str(node_id))),
-            'node_type': element.data.get('type', 'unknown'),
-            'description': element.data.get('description', ''),
-            'status': element.data.get('status', 'pending'),
-            'estimated_hours': element.data.get('estimated_hours', 0)
+            'name': data.get('label', data.get('name', str(node_id))),
+            'node_type': _intern(data.get('type', 'unknown')),
+            'description': data.get('description', ''),
+            'status': _intern(data.get('status', 'pending')),
+            'estimated_hours': data.get('estimated_hours', 0)
         }
         
         # Zusätzliche Cytoscape-spezifische Attribute
-        if element.position:
-            node_attrs['x'] = element.position.get('x', 0)
-            node_attrs['y'] = element.position.get('y', 0)
+        position = element.get('position')
+        if position:
+            node_attrs['x'] = position.get('x', 0)
+            node_attrs['y'] = position.get('y', 0)
         
-        if element.classes:
-            node_attrs['classes'] = element.classes
+        # Ältere Exporte setzen classes = Typ; nur abweichende Klassen übernehmen
+        classes = element.get('classes', '')
+        if classes and classes != node_attrs['node_type']:
+            node_attrs['classes'] = classes
         
         # Icon-Information beibehalten
-        if 'icon' in element.data:
-            node_attrs['icon'] = element.data['icon']
+        if 'icon' in data:
+            node_attrs['icon'] = data['icon']
         
-        self.graph.add_node(node_id, **node_attrs)
+        if not self.lightweight:
+            self._pending_nodes.append((node_id, node_attrs))
         self.nodes_data[node_id] = node_attrs
+        if self._collect_cypher:
+            self._node_cypher[node_id] = self._create_node_cypher(node_id, node_attrs)
     
-    def _add_networkx_edge(self, element: CytoscapeElement):
+    def _add_networkx_edge(self, element: Dict[str, Any]):
         """Fügt Kante zu NetworkX-Graph hinzu"""
-        source = element.data.get('source')
-        target = element.data.get('target')
+        data = element.get('data', {})
+        source = data.get('source')
+        target = data.get('target')
         
         if not source or not target:
-            print(f"⚠️ Kante ohne Quelle/Ziel ignoriert: {element.data}")
+            print(f"⚠️ Kante ohne Quelle/Ziel ignoriert: {data}")
             return
         
         # Edge-Attribute aufbereiten
         edge_attrs = {
-            'relationship': element.data.get('relationship', 'RELATED_TO')
+            'relationship': _intern(data.get('relationship', 'RELATED_TO'))
         }
         
-        if element.classes:
-            edge_attrs['classes'] = element.classes
+        classes = element.get('classes', '')
+        if classes and classes != edge_attrs['relationship']:
+            edge_attrs['classes'] = classes
         
-        # Zusätzliche Edge-Daten
-        for key, value in element.data.items():
-            if key not in ['id', 'source', 'target', 'relationship']:
-                edge_attrs[key] = value
+        # Zusätzliche Edge-Daten: Kopie auf C-Ebene, dann nur die Meta-Felder entfernen
+        extra_attrs = dict(data)
+        for key in _EDGE_META_SKIP:
+            extra_attrs.pop(key, None)
+        edge_attrs.update(extra_attrs)
         
-        self.graph.add_edge(source, target, **edge_attrs)
-        edge_id = element.data.get('id', f"{source}-{target}")
+        if not self.lightweight:
+            self._pending_edges.append((source, target, edge_attrs))
+        edge_id = data.get('id', f"{source}-{target}")
         self.edges_data[edge_id] = edge_attrs
+        self._edge_endpoints[edge_id] = (source, target)
+        if self._collect_cypher:
+            self._relationship_cypher[edge_id] = self._create_relationship_cypher(source, target, edge_attrs)
     
     def cytoscape_to_cypher(self) -> List[str]:
         """Konvertiert Cytoscape.js-Elemente zu Neo4j-Cypher-Statements"""
-        if not self.elements:
+        if not self.elements and not self._streamed_elements:
+            print("❌ Keine Cytoscape-Elemente zum Konvertieren vorhanden")
+            return []
+        
+        if self._streamed_elements is None:
+            # Statements entstehen beim Aufbau des NetworkX-Graphs
+            self._collect_cypher = True
+            try:
+                self.cytoscape_to_networkx()
+            finally:
+                self._collect_cypher = False
+            statements = list(self._node_cypher.values()) + list(self._relationship_cypher.values())
+        else:
+            # Gestreamter Graph existiert bereits - aus den gespeicherten Daten erzeugen
+            statements = list(self._iter_cypher_statements())
+        
+        print(f"🔄 {len(statements)} Cypher-Statements erstellt")
+        return statements
+    
+    def _iter_cypher_statements(self) -> Iterator[str]:
+        """Erzeugt Cypher-Statements einzeln aus dem aufgebauten Graph"""
+        for node_id, node_data in self.nodes_data.items():
+            yield self._create_node_cypher(node_id, node_data)
+        
+        for edge_id, edge_data in self.edges_data.items():
+            source, target = self._edge_endpoints[edge_id]
+            yield self._create_relationship_cypher(source, target, edge_data)
+    
+    def cytoscape_to_cypher_parameterized(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Konvertiert zu parametrisierten MERGE-Statements
+        
+        Liefert (cypher, parameters)-Paare, auszuführen per session.run(cypher, parameters).
+        Der Statement-Text hängt nur von Label bzw. Beziehungstyp ab, daher kann
+        Neo4j den Ausführungsplan wiederverwenden.
+        """
+        if not self.elements and not self._streamed_elements:
             print("❌ Keine Cytoscape-Elemente zum Konvertieren vorhanden")
             return []
         
-        # Erst NetworkX erstellen um Daten zu strukturieren
         self.cytoscape_to_networkx()
         
         statements = []
+        for node_id, node_data in self.nodes_data.items():
+            cypher = _NODE_MERGE_CYPHER.format(label=_label_for(node_data.get('node_type', 'UNKNOWN')))
+            statements.append((cypher, {'id': node_id, 'props': self._node_properties(node_data)}))
+        
+        for edge_id, edge_data in self.edges_data.items():
+            source, target = self._edge_endpoints[edge_id]
+            cypher = _RELATIONSHIP_MERGE_CYPHER.format(relationship=edge_data.get('relationship', 'RELATED_TO').upper())
+            statements.append((cypher, {
+                'source': source,
+                'target': target,
+                'props': self._relationship_properties(edge_data)
+            }))
+        
+        print(f"🔄 {len(statements)} parametrisierte Cypher-Statements erstellt")
+        return statements
+    
+    def cytoscape_to_cypher_batched(self, batch_size: int = 1000) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """Konvertiert zu parametrisierten UNWIND-Statements mit Zeilen-Batches
+        
+        Liefert (cypher, rows)-Paare, auszuführen per session.run(cypher, rows=rows).
+        Knoten werden nach Label, Beziehungen nach Typ gruppiert.
+        """
+        if not self.elements and not self._streamed_elements:
+            print("❌ Keine Cytoscape-Elemente zum Konvertieren vorhanden")
+            return []
+        
+        node_rows, edge_rows = self._collect_cypher_rows()
+        
+        batches = []
+        for label, rows in node_rows.items():
+            cypher = _NODE_UNWIND_CYPHER.format(label=label)
+            for i in range(0, len(rows), batch_size):
+                batches.append((cypher, rows[i:i + batch_size]))
         
-        # 1. Knoten-Statements erstellen
+        for relationship, rows in edge_rows.items():
+            cypher = _RELATIONSHIP_UNWIND_CYPHER.format(relationship=relationship)
+            for i in range(0, len(rows), batch_size):
+                batches.append((cypher, rows[i:i + batch_size]))
+        
+        print(f"🔄 {len(batches)} Cypher-Batches erstellt")
+        return batches
+    
+    def _collect_cypher_rows(self) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, List[Dict[str, Any]]]]:
+        """Gruppiert Knoten-Zeilen nach Label und Kanten-Zeilen nach Beziehungstyp"""
+        self.cytoscape_to_networkx()
+        
+        # 1. Knoten nach Label gruppieren
+        node_rows: Dict[str, List[Dict[str, Any]]] = {}
         for node_id, node_data in self.nodes_data.items():
-            cypher = self._create_node_cypher(node_id, node_data)
-            statements.append(cypher)
+            row = {'id': node_id}
+            row.update(self._node_properties(node_data))
+            node_rows.setdefault(_label_for(node_data.get('node_type', 'UNKNOWN')), []).append(row)
         
-        # 2. Beziehungs-Statements erstellen
+        # 2. Beziehungen nach Typ gruppieren
+        edge_rows: Dict[str, List[Dict[str, Any]]] = {}
         for edge_id, edge_data in self.edges_data.items():
-            # Finde Source und Target für diese Edge
-            source, target = None, None
-            for element in self.elements:
-                if element.get('data', {}).get('id') == edge_id:
-                    source = element['data'].get('source')
-                    target = element['data'].get('target')
-                    break
-            
+            source, target = self._edge_endpoints.get(edge_id, (None, None))
             if source and target:
-                cypher = self._create_relationship_cypher(source, target, edge_data)
-                statements.append(cypher)
+                relationship = edge_data.get('relationship', 'RELATED_TO').upper()
+                edge_rows.setdefault(relationship, []).append({
+                    'src': source,
+                    'tgt': target,
+                    'props': self._relationship_properties(edge_data)
+                })
         
-        print(f"🔄 {len(statements)} Cypher-Statements erstellt")
-        return statements
+        return node_rows, edge_rows
+    
+    def ingest_parallel(self, driver, num_threads: int = 8, batch_size: int = 500) -> int:
+        """Schreibt den Graph mit mehreren Threads per UNWIND-Batches in Neo4j
+        
+        Knoten-Batches laufen parallel, danach die Kanten in Runden (siehe _edge_rounds):
+        gleichzeitig laufende Transaktionen sperren nie denselben Knoten. Gibt die Anzahl
+        geschriebener Elemente zurück.
+        """
+        if num_threads < 1:
+            raise ValueError(f"num_threads muss mindestens 1 sein, nicht {num_threads}")
+        if batch_size < 1:
+            raise ValueError(f"batch_size muss mindestens 1 sein, nicht {batch_size}")
+        
+        if not self.elements and not self._streamed_elements:
+            print("❌ Keine Cytoscape-Elemente zum Konvertieren vorhanden")
+            return 0
+        
+        node_rows, edge_rows = self._collect_cypher_rows()
+        
+        # 1. Knoten: einfache Batches, Reihenfolge egal (CREATE sperrt keine fremden Knoten)
+        node_jobs = []
+        for label, rows in node_rows.items():
+            cypher = _NODE_UNWIND_CYPHER.format(label=label)
+            for i in range(0, len(rows), batch_size):
+                node_jobs.append([(cypher, rows[i:i + batch_size])])
+        
+        def run(jobs: List[Tuple[str, List[Dict[str, Any]]]]) -> int:
+            return self._run_cypher_batches(driver, jobs)
+        
+        written = 0
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            written += sum(executor.map(run, node_jobs))
+            # 2. Kanten erst, wenn alle Knoten existieren; jede Runde vor der nächsten abschließen
+            for jobs in _edge_rounds(edge_rows, num_threads, batch_size):
+                written += sum(executor.map(run, jobs))
+        
+        print(f"✅ {written} Elemente parallel nach Neo4j geschrieben ({num_threads} Threads)")
+        return written
+    
+    @staticmethod
+    def _run_cypher_batches(driver, jobs: List[Tuple[str, List[Dict[str, Any]]]], max_retries: int = 3) -> int:
+        """Führt Batches in einer eigenen Session aus, mit Retry bei Deadlocks"""
+        from neo4j.exceptions import TransientError
+        
+        written = 0
+        with driver.session() as session:
+            for cypher, rows in jobs:
+                for attempt in range(max_retries + 1):
+                    try:
+                        session.run(cypher, rows=rows).consume()
+                        written += len(rows)
+                        break
+                    except TransientError as e:
+                        if attempt == max_retries:
+                            raise
+                        print(f"⚠️ Transienter Fehler, Versuch {attempt + 1}/{max_retries}: {e}")
+                        time.sleep(0.1 * (attempt + 1))
+        return written
+    
+    def _node_properties(self, node_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Filtert Knoten-Eigenschaften, die in Neo4j gespeichert werden"""
+        return {
+            key: value for key, value in node_data.items()
+            if key not in _NODE_SKIP and isinstance(value, (str, int, float))
+        }
+    
+    def _relationship_properties(self, edge_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Filtert Beziehungs-Eigenschaften, die in Neo4j gespeichert werden"""
+        return {
+            key: value for key, value in edge_data.items()
+            if key not in _RELATIONSHIP_SKIP and isinstance(value, (str, int, float))
+        }
     
     def _create_node_cypher(self, node_id: str, node_data: Dict[str, Any]) -> str:
         """Erstellt Cypher-Statement für Knoten"""
-        node_type = node_data.get('node_type', 'UNKNOWN').upper()
-        
-        # Spezielle Behandlung für Ressourcen-Knoten
-        if node_type in ['ACTOR', 'OBJECT', 'KNOWLEDGE', 'BUDGET']:
-            label = f"RESOURCE:{node_type}"
-        else:
-            label = node_type
+        label = _label_for(node_data.get('node_type', 'UNKNOWN'))
         
-        # Eigenschaften für Cypher formatieren
-        props = []
+        # Schema (Schlüssel + String/Zahl) bestimmen, die Vorlage wird je Schema gecacht
+        fields = []
+        values = []
         for key, value in node_data.items():
-            if key not in ['node_type', 'classes', 'x', 'y', 'icon'] and value is not None:
+            if key not in _NODE_SKIP and value is not None:
                 if isinstance(value, str):
-                    # Escape Anführungszeichen
-                    escaped_value = value.replace('"', '\\"').replace('\n', '\\n')
-                    props.append(f'{key}: "{escaped_value}"')
+                    fields.append((key, True))
+                    values.append(value.translate(_CYPHER_ESC))
                 elif isinstance(value, (int, float)):
-                    props.append(f'{key}: {value}')
-                elif isinstance(value, bool):
-                    props.append(f'{key}: {str(value).lower()}')
-        
-        props_str = ", ".join(props)
+                    fields.append((key, False))
+                    values.append(value)
         
-        return f'CREATE (n:{label} {{{props_str}}})'
+        return _node_cypher_template(label, tuple(fields)).format(*values)
     
     def _create_relationship_cypher(self, source_id: str, target_id: str, edge_data: Dict[str, Any]) -> str:
         """Erstellt Cypher-Statement für Beziehungen"""
@@ -215,9 +547,9 @@ class Cytoscape2GraphConverter:
         # Zusätzliche Eigenschaften für Beziehung
         props = []
         for key, value in edge_data.items():
-            if key not in ['relationship', 'classes'] and value is not None:
+            if key not in _RELATIONSHIP_SKIP and value is not None:
                 if isinstance(value, str):
-                    escaped_value = value.replace('"', '\\"').replace('\n', '\\n')
+                    escaped_value = value.translate(_CYPHER_ESC)
                     props.append(f'{key}: "{escaped_value}"')
                 elif isinstance(value, (int, float)):
                     props.append(f'{key}: {value}')
@@ -228,15 +560,34 @@ class Cytoscape2GraphConverter:
 WHERE a.id = "{source_id}" AND b.id = "{target_id}"
 CREATE (a)-[:{relationship}{props_str}]->(b)'''
     
-    def export_networkx_to_file(self, output_file: str = "converted_graph.gpickle") -> str:
-        """Exportiert NetworkX-Graph in Datei"""
+    def export_networkx_to_file(self, output_file: str = "converted_graph.npz") -> str:
+        """Exportiert NetworkX-Graph spaltenweise (Knoten-Arrays + Kanten-Indizes) als .npz"""
         try:
             if not self.graph.nodes():
                 print("❌ Kein Graph zum Exportieren vorhanden")
                 return ""
             
-            # Als Pickle exportieren für vollständige NetworkX-Kompatibilität
-            nx.write_gpickle(self.graph, output_file)
+            node_ids = list(self.graph.nodes)
+            node_index = {node_id: i for i, node_id in enumerate(node_ids)}
+            nodes = self.graph.nodes
+            
+            # Kanten als Index-Paare in node_ids
+            edges = list(self.graph.edges(data='relationship', default='RELATED_TO'))
+            
+            np.savez_compressed(
+                output_file,
+                node_ids=np.array([str(node_id) for node_id in node_ids]),
+                name=np.array([str(nodes[n].get('name', n)) for n in node_ids]),
+                node_type=np.array([nodes[n].get('node_type', 'unknown') for n in node_ids]),
+                description=np.array([nodes[n].get('description', '') for n in node_ids]),
+                status=np.array([nodes[n].get('status', 'pending') for n in node_ids]),
+                estimated_hours=np.array([nodes[n].get('estimated_hours', 0) or 0 for n in node_ids], dtype=np.float32),
+                sources=np.array([node_index[u] for u, _, _ in edges], dtype=np.int32),
+                targets=np.array([node_index[v] for _, v, _ in edges], dtype=np.int32),
+                relationships=np.array([rel for _, _, rel in edges])
+            )
+            if not output_file.endswith('.npz'):
+                output_file += '.npz'
             print(f"💾 NetworkX-Graph exportiert: {output_file}")
             return output_file
             
@@ -245,24 +596,31 @@ CREATE (a)-[:{relationship}{props_str}]->(b)'''
             return ""
     
     def export_cypher_to_file(self, output_file: str = "graph_cypher.cyp") -> str:
-        """Exportiert Cypher-Statements in Datei"""
+        """Exportiert Cypher-Statements in Datei (Statement für Statement, ohne Zwischenliste)"""
         try:
-            statements = self.cytoscape_to_cypher()
+            if not self.elements and not self._streamed_elements:
+                print("❌ Keine Cytoscape-Elemente zum Konvertieren vorhanden")
+                return ""
             
-            if not statements:
+            self.cytoscape_to_networkx()
+            
+            if not self.nodes_data and not self.edges_data:
                 print("❌ Keine Cypher-Statements zum Exportieren vorhanden")
                 return ""
             
-            with open(output_file, 'w', encoding='utf-8') as f:
+            count = 0
+            
+            def export_chunks() -> Iterator[str]:
+                nonlocal count
+                for count, statement in enumerate(self._iter_cypher_statements(), 1):
+                    yield f"// Statement {count}:\n{statement.strip()};\n\n"
+            
+            with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
                 f.write("// Automatisch generierte Cypher-Statements\n")
                 f.write(f"// Erstellt am: {datetime.now().isoformat()}\n\n")
-                
-                for i, statement in enumerate(statements, 1):
-                    f.write(f"// Statement {i}:\n")
-                    f.write(statement.strip())
-                    f.write(";\n\n")
+                f.writelines(export_chunks())
             
-            print(f"💾 Cypher-Statements exportiert: {output_file}")
+            print(f"💾 {count} Cypher-Statements exportiert: {output_file}")
             return output_file
             
         except Exception as e:
@@ -271,25 +629,15 @@ CREATE (a)-[:{relationship}{props_str}]->(b)'''
     
     def get_conversion_summary(self) -> Dict[str, Any]:
         """Gibt Zusammenfassung der Konvertierung zurück"""
-        node_types = {}
-        edge_types = {}
-        
-        # Knoten-Typen zählen
-        for node_data in self.nodes_data.values():
-            node_type = node_data.get('node_type', 'unknown')
-            node_types[node_type] = node_types.get(node_type, 0) + 1
-        
-        # Edge-Typen zählen
-        for edge_data in self.edges_data.values():
-            edge_type = edge_data.get('relationship', 'RELATED_TO')
-            edge_types[edge_type] = edge_types.get(edge_type, 0) + 1
+        node_types = Counter(node_data.get('node_type', 'unknown') for node_data in self.nodes_data.values())
+        edge_types = Counter(edge_data.get('relationship', 'RELATED_TO') for edge_data in self.edges_data.values())
         
         return {
-            'total_elements': len(self.elements),
+            'total_elements': self._streamed_elements if self._streamed_elements is not None else len(self.elements),
             'nodes_count': len(self.nodes_data),
             'edges_count': len(self.edges_data),
-            'node_types': node_types,
-            'edge_types': edge_types,
+            'node_types': dict(node_types),
+            'edge_types': dict(edge_types),
             'networkx_nodes': self.graph.number_of_nodes(),
             'networkx_edges': self.graph.number_of_edges()
         }
@@ -6,20 +6,151 @@ Erstellt interaktive Web-Visualisierungen mit Cytoscape.js
 
 import networkx as nx
 import json
-import webbrowser
 import os
-from typing import Dict, Any, List, Optional
+import re
+import io
+import sys
+import gzip
+import shutil
+import hashlib
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from functools import lru_cache
+from typing import Dict, Any, Final, Iterable, Iterator, List, Optional, TextIO, Tuple
 from dataclasses import dataclass
-from Plan2Graph import PlanGraphConverter, load_plan_from_file, get_sample_plan
 
+__all__ = ["CytoscapeStyle", "CytoscapeVisualizer", "load_cytoscape_from_file", "download_assets"]
 
-@dataclass
+# Optional: orjson für schnellere Serialisierung, sonst stdlib json
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any, indent: bool = False) -> str:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode()
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any, indent: bool = False) -> str:
+        if indent:
+            return json.dumps(obj, indent=2, ensure_ascii=False)
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+
+def _intern(value: Any) -> Any:
+    """Interniert Strings, damit wiederkehrende Typ-/Beziehungsnamen ein Objekt teilen"""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _compact_hours(value: Any) -> Any:
+    """Ganzzahlige Stundenwerte als int (8 statt 8.0), Bruchteile bleiben erhalten"""
+    return int(value) if type(value) is float and value.is_integer() else value
+
+
+def _layered_positions(graph: nx.DiGraph, layer_spacing: int = 120,
+                       node_spacing: int = 100) -> Dict[Any, Tuple[int, int]]:
+    """Hierarchisches Layout wie dagre (oben -> unten), komplett in NetworkX berechnet
+    
+    Ebene = längster Pfad von einer Quelle; Zyklen werden über die stark
+    zusammenhängenden Komponenten aufgelöst. Innerhalb einer Ebene werden die Knoten
+    nach der mittleren Position ihrer Vorgänger sortiert (weniger Kantenkreuzungen).
+    """
+    condensed = nx.condensation(graph)
+    component_of = condensed.graph['mapping']
+    layer_of = {}
+    for layer, components in enumerate(nx.topological_generations(condensed)):
+        for component in components:
+            layer_of[component] = layer
+    
+    layers = defaultdict(list)
+    for node in graph:
+        layers[layer_of[component_of[node]]].append(node)
+    
+    positions = {}
+    
+    def barycenter(node):
+        xs = [positions[p][0] for p in graph._pred[node] if p in positions]
+        return sum(xs) / len(xs) if xs else 0
+    
+    for layer in sorted(layers):
+        nodes = layers[layer]
+        if layer:
+            nodes.sort(key=barycenter)
+        offset = (len(nodes) - 1) / 2
+        for index, node in enumerate(nodes):
+            positions[node] = (round((index - offset) * node_spacing), layer * layer_spacing)
+    return positions
+
+# Icon mapping für verschiedene Knotentypen (FontAwesome-Zeichen)
+ICON_MAP: Final[Dict[str, str]] = {
+    "objective": "\uf3a5",  # Flag
+    "project": "\uf07b",   # Folder
+    "task": "\uf0ae",      # Tasks
+    "actor": "\uf007",     # User
+    "object": "\uf1b2",    # Cube
+    "knowledge": "\uf02d", # Book
+    "budget": "\uf155"     # Dollar
+}
+DEFAULT_ICON: Final = "\uf128"  # Question mark
+
+# Fallbacks für Typen ohne eigene Style-Konfiguration (Cytoscape.js-Standardwerte)
+DEFAULT_NODE_COLOR = "#999"
+DEFAULT_NODE_SIZE = 30
+DEFAULT_EDGE_COLOR = "#ccc"
+
+# HTML-Template (statische Datei), einmal beim Import vor/nach den Graph-Daten geteilt
+_TEMPLATE_PATH = Path(__file__).parent / "templates" / "cytoscape.html"
+_HTML_HEAD, _, _HTML_TAIL = _TEMPLATE_PATH.read_text(encoding='utf-8').partition("{{DATA_JSON}}")
+# Kopf zusätzlich am Titel geteilt: pro Seite nur noch join statt Suchen/Ersetzen
+_HTML_HEAD_PARTS = tuple(_HTML_HEAD.split("{{TITLE}}"))
+
+# JS-Bibliotheken des Templates; lokale Kopien in assets/ können eingebettet werden (offline)
+_ASSETS_DIR = Path(__file__).parent / "assets"
+_SCRIPT_ASSETS = {
+    "cytoscape.min.js": "https://unpkg.com/cytoscape@3.26.0/dist/cytoscape.min.js",
+    "dagre.min.js": "https://unpkg.com/dagre@0.8.5/dist/dagre.min.js",
+    "cytoscape-dagre.js": "https://unpkg.com/cytoscape-dagre@2.5.0/cytoscape-dagre.js",
+    "layout-base.js": "https://unpkg.com/layout-base@2.0.1/layout-base.js",
+    "cose-base.js": "https://unpkg.com/cose-base@2.2.0/cose-base.js",
+    "cytoscape-fcose.js": "https://unpkg.com/cytoscape-fcose@2.2.0/cytoscape-fcose.js"
+}
+
+# Im Browser angelegte Knoten heißen node_<n>; die nächste freie Nummer wird mitgeliefert
+_NODE_NUMBER = re.compile(r'node_([0-9]+)')
+
+# Anzahl der pro Visualizer zwischengespeicherten HTML-Seiten (generate_html_template)
+_HTML_CACHE_SIZE = 16
+
+# Spaltenformat: je Feld ein Array (Reihenfolge der Spalten im Payload)
+NODE_COLUMNS = ("id", "label", "type", "description", "estimated_hours", "status")
+EDGE_COLUMNS = ("source", "target", "relationship")
+
+
+@dataclass(frozen=True)
 class CytoscapeStyle:
-    """Styling-Konfiguration für Cytoscape.js"""
+    """Styling-Konfiguration für Cytoscape.js (unveränderlich, damit das Stylesheet gecacht werden kann)"""
     node_colors: Dict[str, str]
     node_sizes: Dict[str, int]
     edge_colors: Dict[str, str]
     
+    def __hash__(self):
+        # Einmal je Instanz berechnen: der Style ist Schlüssel der Stylesheet-Caches
+        cached = self.__dict__.get('_hash')
+        if cached is None:
+            cached = hash((frozenset(self.node_colors.items()),
+                           frozenset(self.node_sizes.items()),
+                           frozenset(self.edge_colors.items())))
+            object.__setattr__(self, '_hash', cached)
+        return cached
+    
+    def __getstate__(self):
+        # String-Hashes sind prozessabhängig, daher den gemerkten Hash nicht mitpicklen
+        state = self.__dict__.copy()
+        state.pop('_hash', None)
+        return state
+    
     @classmethod
     def default(cls):
         return cls(
@@ -49,66 +180,221 @@ class CytoscapeStyle:
         )
 
 
+# Gemeinsame Standard-Instanz (unveränderlich): Hash und Stylesheet-Caches werden geteilt
+_DEFAULT_STYLE = CytoscapeStyle.default()
+
+
+@lru_cache(maxsize=8)
+def _build_style_json(style: CytoscapeStyle) -> str:
+    """Serialisiertes (kompaktes) Stylesheet, einmal pro Style erzeugt"""
+    return _json_dumps(CytoscapeVisualizer(style).generate_cytoscape_style())
+
+
+@lru_cache(maxsize=8)
+def _build_type_styles_json(style: CytoscapeStyle) -> str:
+    """Darstellungsattribute je Typ für im Browser neu angelegte Elemente"""
+    visualizer = CytoscapeVisualizer(style)
+    node_types = dict.fromkeys([*ICON_MAP, *style.node_colors, *style.node_sizes])
+    return _json_dumps({
+        "node": {node_type: visualizer._node_visual_data(node_type) for node_type in node_types},
+        "node_default": visualizer._node_visual_data(None),
+        "edge": dict(style.edge_colors),
+        "edge_default": DEFAULT_EDGE_COLOR
+    })
+
+
+@lru_cache(maxsize=8)
+def _build_html_tail(style: CytoscapeStyle, debug: bool = False) -> str:
+    """HTML-Rest nach den Graph-Daten mit eingesetzten Styles, einmal pro Style erzeugt"""
+    return (_HTML_TAIL.replace("{{TYPE_STYLES_JSON}}", _build_type_styles_json(style))
+                      .replace("{{STYLE_JSON}}", _build_style_json(style))
+                      .replace("{{DEBUG}}", _json_dumps(debug)))
+
+
 class CytoscapeVisualizer:
     """Erstellt Cytoscape.js-Visualisierungen aus NetworkX-Graphen"""
     
-    def __init__(self, style: Optional[CytoscapeStyle] = None):
-        self.style = style if style else CytoscapeStyle.default()
+    def __init__(self, style: Optional[CytoscapeStyle] = None, inline_assets: bool = False,
+                 debug: bool = False):
+        self.style = style if style else _DEFAULT_STYLE
+        self.inline_assets = inline_assets
+        # Diagnose-Ausgaben (console.log) in der erzeugten Seite
+        self.debug = debug
+        self._html_cache: "OrderedDict[Tuple[str, CytoscapeStyle, bool, bool, bytes], bytes]" = OrderedDict()
     
-    def networkx_to_cytoscape(self, graph: nx.DiGraph) -> Dict[str, Any]:
+    def networkx_to_cytoscape(self, graph: nx.DiGraph) -> List[Dict[str, Any]]:
         """Konvertiert NetworkX-Graph zu Cytoscape.js-Format"""
         
-        elements = []
-        
-        # Knoten konvertieren
-        for node_id, node_data in graph.nodes(data=True):
-            node_type = node_data.get('node_type', node_data.get('resource_type', 'unknown'))
-            
-            # Icon mapping für verschiedene Knotentypen
-            icon_map = {
-                "objective": "\uf3a5",  # Flag
-                "project": "\uf07b",   # Folder
-                "task": "\uf0ae",      # Tasks
-                "actor": "\uf007",     # User
-                "object": "\uf1b2",    # Cube
-                "knowledge": "\uf02d", # Book
-                "budget": "\uf155"     # Dollar
-            }
-            
-            cytoscape_node = {
-                "data": {
-                    "id": str(node_id),
-                    "label": node_data.get('name', str(node_id)),
-                    "icon": icon_map.get(node_type, "\uf128"),  # Default: question mark
-                    "type": node_type,
-                    "description": node_data.get('description', ''),
-                    "estimated_hours": node_data.get('estimated_hours', 0),
-                    "status": node_data.get('status', 'pending')
-                },
-                "classes": node_type
-            }
-            
-            elements.append(cytoscape_node)
+        # Elemente in einem Durchlauf über den Generator einsammeln
+        return list(self._iter_cytoscape(graph))
+    
+    def _node_visual_data(self, node_type: Optional[str]) -> Dict[str, Any]:
+        """Icon, Farbe und Größe eines Knotentyps (ausgewertet über data()-Mapper im Stylesheet)"""
         
-        # Kanten konvertieren
-        for source, target, edge_data in graph.edges(data=True):
-            relationship = edge_data.get('relationship', 'RELATED_TO')
-            
-            cytoscape_edge = {
-                "data": {
-                    "id": f"{source}-{target}",
-                    "source": str(source),
-                    "target": str(target),
-                    "relationship": relationship
-                },
-                "classes": relationship
+        return {
+            "icon": ICON_MAP.get(node_type, DEFAULT_ICON),
+            "bg_color": self.style.node_colors.get(node_type, DEFAULT_NODE_COLOR),
+            "size": self.style.node_sizes.get(node_type, DEFAULT_NODE_SIZE)
+        }
+    
+    def networkx_to_cytoscape_columnar(self, graph: nx.DiGraph,
+                                       positions: Optional[Dict[Any, Tuple[int, int]]] = None) -> Dict[str, Any]:
+        """Konvertiert NetworkX-Graph ins kompakte Spaltenformat (ein Array je Feld)
+        
+        Typen, Status und Beziehungen werden als Index in die Tabellen "types"/"statuses"/
+        "relationships" kodiert, Kanten verweisen per Index auf die Knoten. Label fehlt (null), wenn es
+        der ID entspricht; optionale Spalten ohne Werte entfallen ganz. Die Elemente
+        werden im Browser wieder zusammengesetzt (siehe expandElements im HTML-Template).
+        next_node_id ist die erste freie Nummer für im Editor angelegte Knoten (node_<n>).
+        Mit positions kommen die Spalten "x"/"y" hinzu (Browser nutzt dann Layout "preset").
+        """
+        
+        types = {}
+        status_table = {}
+        ids = []
+        labels = []
+        type_codes = []
+        descriptions = []
+        hours = []
+        statuses = []
+        node_index = {}
+        max_node_number = 0
+        
+        for index, (node_id, node_data) in enumerate(graph._node.items()):
+            node_index[node_id] = index
+            get = node_data.get
+            raw_type = get('node_type')
+            if raw_type is None:
+                raw_type = get('resource_type', 'unknown')
+            type_code = types.get(raw_type)
+            if type_code is None:
+                type_code = types[raw_type] = len(types)
+            status = get('status')
+            if status == 'pending' or not status:
+                status_code = None
+            else:
+                status_code = status_table.get(status)
+                if status_code is None:
+                    status_code = status_table[status] = len(status_table)
+            
+            node_id_str = str(node_id)
+            if node_id_str.startswith('node_'):
+                match = _NODE_NUMBER.match(node_id_str)
+                if match and int(match.group(1)) > max_node_number:
+                    max_node_number = int(match.group(1))
+            label = get('name', node_id_str)
+            ids.append(node_id_str)
+            labels.append(None if label == node_id_str else label)
+            type_codes.append(type_code)
+            descriptions.append(get('description') or None)
+            hours.append(_compact_hours(get('estimated_hours')) or None)
+            statuses.append(status_code)
+        
+        relationships = {}
+        sources = []
+        targets = []
+        relationship_codes = []
+        
+        for source, neighbors in graph._adj.items():
+            source_index = node_index[source]
+            for target, edge_data in neighbors.items():
+                raw_relationship = edge_data.get('relationship', 'RELATED_TO')
+                relationship_code = relationships.get(raw_relationship)
+                if relationship_code is None:
+                    relationship_code = relationships[raw_relationship] = len(relationships)
+                sources.append(source_index)
+                targets.append(node_index[target])
+                relationship_codes.append(relationship_code)
+        
+        nodes = dict(zip(NODE_COLUMNS, (ids, labels, type_codes, descriptions, hours, statuses)))
+        for column in NODE_COLUMNS[3:]:
+            if not any(value is not None for value in nodes[column]):
+                del nodes[column]
+        if positions is not None:
+            nodes["x"] = [positions[node_id][0] for node_id in graph._node]
+            nodes["y"] = [positions[node_id][1] for node_id in graph._node]
+        
+        return {
+            "types": list(types),
+            "statuses": list(status_table),
+            "relationships": list(relationships),
+            "nodes": nodes,
+            "edges": dict(zip(EDGE_COLUMNS, (sources, targets, relationship_codes))),
+            "next_node_id": max_node_number + 1
+        }
+    
+    def _iter_cytoscape(self, graph: nx.DiGraph) -> Iterator[Dict[str, Any]]:
+        """Liefert die Cytoscape.js-Elemente einzeln (erst Knoten, dann Kanten)"""
+        
+        n_nodes = 0
+        n_edges = 0
+        # Je Typ/Beziehung einmal internierte Namen
+        node_types = {}
+        node_type_get = node_types.get
+        relationships = {}
+        relationship_get = relationships.get
+        
+        # Knoten konvertieren (direkt über die internen Attribut-Dicts, ohne NodeDataView)
+        for node_id, node_data in graph._node.items():
+            get = node_data.get
+            raw_type = get('node_type')
+            if raw_type is None:
+                raw_type = get('resource_type', 'unknown')
+            
+            node_type = node_type_get(raw_type)
+            if node_type is None:
+                node_type = node_types[raw_type] = _intern(raw_type)
+            
+            node_id_str = str(node_id)
+            data = {
+                "id": node_id_str,
+                "label": get('name', node_id_str),
+                "type": node_type
             }
             
-            elements.append(cytoscape_edge)
-        
-        print(f"Created {len([e for e in elements if 'source' not in e['data']])} nodes and {len([e for e in elements if 'source' in e['data']])} edges")
+            # Optionale Felder nur mitsenden, wenn sie vom Standard abweichen
+            description = get('description')
+            if description:
+                data["description"] = description
+            estimated_hours = get('estimated_hours')
+            if estimated_hours:
+                data["estimated_hours"] = _compact_hours(estimated_hours)
+            status = get('status')
+            if status and status != 'pending':
+                data["status"] = status
+            
+            # group explizit, damit Cytoscape den Elementtyp nicht erst ableiten muss
+            cytoscape_node = {"group": "nodes", "data": data}
+            
+            n_nodes += 1
+            yield cytoscape_node
+        
+        # Kanten konvertieren (Adjazenz-Dict: Quelle -> {Ziel: Attribute})
+        for source, neighbors in graph._adj.items():
+            source_str = str(source)
+            id_prefix = source_str + '-'  # Kanten-ID "<quelle>-<ziel>" wie beim Anlegen im Browser
+            for target, edge_data in neighbors.items():
+                raw_relationship = edge_data.get('relationship', 'RELATED_TO')
+                
+                relationship = relationship_get(raw_relationship)
+                if relationship is None:
+                    relationship = relationships[raw_relationship] = _intern(raw_relationship)
+                
+                target_str = str(target)
+                cytoscape_edge = {
+                    "group": "edges",
+                    "data": {
+                        "id": id_prefix + target_str,
+                        "source": source_str,
+                        "target": target_str,
+                        "relationship": relationship
+                    }
+                }
+                
+                n_edges += 1
+                yield cytoscape_edge
         
-        return elements
+        print(f"Created {n_nodes} nodes and {n_edges} edges")
     
     def generate_cytoscape_style(self) -> List[Dict[str, Any]]:
         """Generiert Cytoscape.js-Stylesheet"""
@@ -120,10 +406,15 @@ class CytoscapeVisualizer:
             "selector": "node",
             "style": {
                 "content": "data(icon)",
+                "background-color": "data(bg_color)",
+                "width": "data(size)",
+                "height": "data(size)",
                 "text-valign": "center",
                 "text-halign": "center",
                 "font-family": "FontAwesome, Arial, sans-serif",
                 "font-size": "24px",
+                # Weit herausgezoomt (Icon < 8px) wird kein Text mehr gezeichnet
+                "min-zoomed-font-size": 8,
                 "color": "#333",
                 "border-width": 2,
                 "border-color": "#000",
@@ -133,73 +424,34 @@ class CytoscapeVisualizer:
             }
         })
         
-        # Label-Style für Hover
+        # Auswahl: Label statt Icon und hervorgehobener Rand (ein gemeinsamer Block)
         style.append({
             "selector": "node:selected",
             "style": {
                 "content": "data(label)",
                 "font-size": "10px",
+                "min-zoomed-font-size": 8,
                 "font-family": "Arial, sans-serif",
                 "text-valign": "bottom",
-                "text-margin-y": "5px"
+                "text-margin-y": "5px",
+                "border-width": 4,
+                "border-color": "#000"
             }
         })
         
-        # Knotentyp-spezifische Styles mit Icons
-        icon_map = {
-            "objective": "\uf3a5",  # Flag
-            "project": "\uf07b",   # Folder
-            "task": "\uf0ae",      # Tasks
-            "actor": "\uf007",     # User
-            "object": "\uf1b2",    # Cube
-            "knowledge": "\uf02d", # Book
-            "budget": "\uf155"     # Dollar
-        }
-        
-        for node_type, color in self.style.node_colors.items():
-            icon_char = icon_map.get(node_type, '\uf128')  # Default: question mark
-            style.append({
-                "selector": f".{node_type}",
-                "style": {
-                    "background-color": color,
-                    "width": f"{self.style.node_sizes.get(node_type, 50)}px",
-                    "height": f"{self.style.node_sizes.get(node_type, 50)}px",
-                    "content": f"'{icon_char}'"
-                }
-            })
-        
         # Basis-Kanten-Style
         style.append({
             "selector": "edge",
             "style": {
                 "width": 3,
-                "line-color": "#ccc",
-                "target-arrow-color": "#ccc",
+                "line-color": "data(line_color)",
+                "target-arrow-color": "data(line_color)",
                 "target-arrow-shape": "triangle",
                 "curve-style": "bezier",
                 "arrow-scale": 1.5
             }
         })
         
-        # Beziehungstyp-spezifische Styles
-        for relationship, color in self.style.edge_colors.items():
-            style.append({
-                "selector": f".{relationship}",
-                "style": {
-                    "line-color": color,
-                    "target-arrow-color": color
-                }
-            })
-        
-        # Hover-Effekte
-        style.append({
-            "selector": "node:selected",
-            "style": {
-                "border-width": 4,
-                "border-color": "#000"
-            }
-        })
-        
         # Tooltip-Style beim Hover
         style.append({
             "selector": "node:active",
@@ -213,968 +465,262 @@ class CytoscapeVisualizer:
     
     def generate_html_template(self, cytoscape_elements: List[Dict[str, Any]], 
                              title: str = "Graph Visualisierung") -> str:
-        """Generiert HTML-Template für Cytoscape.js"""
-        
-        style_json = json.dumps(self.generate_cytoscape_style(), indent=2)
-        data_json = json.dumps(cytoscape_elements, indent=2)
-        
-        html_template = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <title>{title}</title>
-    <script src="https://unpkg.com/cytoscape@3.26.0/dist/cytoscape.min.js"></script>
-    <script src="https://unpkg.com/dagre@0.8.5/dist/dagre.min.js"></script>
-    <script src="https://unpkg.com/cytoscape-dagre@2.5.0/cytoscape-dagre.js"></script>
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css">
-    <style>
-        body {{
-            font-family: Arial, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }}
-        
-        h1 {{
-            text-align: center;
-            color: #333;
-            margin-bottom: 20px;
-        }}
-        
-        #cy {{
-            width: 100%;
-            height: 80vh;
-            border: 1px solid #ddd;
-            border-radius: 8px;
-            background-color: white;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        
-        .controls {{
-            margin-bottom: 20px;
-            text-align: center;
-        }}
-        
-        button {{
-            background-color: #4ECDC4;
-            color: white;
-            border: none;
-            padding: 10px 20px;
-            margin: 0 5px;
-            border-radius: 5px;
-            cursor: pointer;
-            font-size: 14px;
-        }}
-        
-        select {{
-            background-color: #4ECDC4;
-            color: white;
-            border: none;
-            padding: 10px 15px;
-            margin: 0 5px;
-            border-radius: 5px;
-            cursor: pointer;
-            font-size: 14px;
-            min-width: 200px;
-        }}
-        
-        select option {{
-            background-color: white;
-            color: black;
-            padding: 5px;
-        }}
-        
-        button:hover {{
-            background-color: #45B7D1;
-        }}
-        
-        .edit-controls {{
-            position: fixed;
-            bottom: 20px;
-            right: 20px;
-            background: white;
-            border: 1px solid #ddd;
-            border-radius: 5px;
-            padding: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        
-        .edit-controls button {{
-            display: block;
-            width: 100%;
-            margin: 5px 0;
-            background-color: #27AE60;
-        }}
-        
-        .edit-controls button:hover {{
-            background-color: #2ECC71;
-        }}
-        
-        .edit-controls button.delete {{
-            background-color: #E74C3C;
-        }}
-        
-        .edit-controls button.delete:hover {{
-            background-color: #C0392B;
-        }}
-        
-        .modal {{
-            display: none;
-            position: fixed;
-            z-index: 1000;
-            left: 0;
-            top: 0;
-            width: 100%;
-            height: 100%;
-            background-color: rgba(0,0,0,0.4);
-        }}
-        
-        .modal-content {{
-            background-color: white;
-            margin: 15% auto;
-            padding: 20px;
-            border: 1px solid #888;
-            border-radius: 5px;
-            width: 400px;
-            max-width: 90%;
-        }}
-        
-        .modal-content h3 {{
-            margin-top: 0;
-        }}
-        
-        .modal-content input, .modal-content select, .modal-content textarea {{
-            width: 100%;
-            padding: 8px;
-            margin: 5px 0;
-            border: 1px solid #ddd;
-            border-radius: 3px;
-            box-sizing: border-box;
-        }}
-        
-        .modal-content textarea {{
-            height: 100px;
-            resize: vertical;
-        }}
-        
-        .modal-buttons {{
-            text-align: right;
-            margin-top: 20px;
-        }}
-        
-        .modal-buttons button {{
-            margin-left: 10px;
-        }}
-        
-        .context-menu {{
-            position: absolute;
-            background: white;
-            border: 1px solid #ddd;
-            border-radius: 5px;
-            padding: 5px 0;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            z-index: 1000;
-            display: none;
-        }}
-        
-        .context-menu-item {{
-            padding: 8px 15px;
-            cursor: pointer;
-            font-size: 14px;
-        }}
-        
-        .context-menu-item:hover {{
-            background-color: #f5f5f5;
-        }}
-        
-        .info-panel {{
-            position: fixed;
-            top: 20px;
-            right: 20px;
-            background: white;
-            border: 1px solid #ddd;
-            border-radius: 5px;
-            padding: 15px;
-            max-width: 300px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            display: none;
-        }}
-        
-        .info-panel h3 {{
-            margin-top: 0;
-            color: #333;
-        }}
-        
-        .legend {{
-            margin-top: 20px;
-            background: white;
-            padding: 15px;
-            border-radius: 5px;
-            border: 1px solid #ddd;
-        }}
-        
-        .legend-item {{
-            display: flex;
-            align-items: center;
-            margin: 5px 0;
-        }}
-        
-        .legend-color {{
-            width: 20px;
-            height: 20px;
-            border-radius: 50%;
-            margin-right: 10px;
-            border: 1px solid #000;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 12px;
-            color: #333;
-        }}
-        
-        .legend-edge {{
-            width: 30px;
-            height: 3px;
-            margin-right: 10px;
-            border-radius: 2px;
-            position: relative;
-            display: flex;
-            align-items: center;
-        }}
-        
-        .legend-edge::after {{
-            content: '';
-            position: absolute;
-            right: -3px;
-            top: 50%;
-            transform: translateY(-50%);
-            width: 0;
-            height: 0;
-            border-left: 6px solid currentColor;
-            border-top: 3px solid transparent;
-            border-bottom: 3px solid transparent;
-        }}
-    </style>
-</head>
-<body>
-    <h1>{title}</h1>
-    
-    <div class="controls">
-        <button onclick="resetView()">🔄 Ansicht zurücksetzen</button>
-        <button onclick="fitToScreen()">🔍 An Bildschirm anpassen</button>
-        <select id="layout-select" onchange="changeLayout()">
-            <option value="0">📐 Dagre (Hierarchisch)</option>
-            <option value="1">🌳 Breadth-First (Baum)</option>
-            <option value="2">⭕ Kreis</option>
-            <option value="3">🎯 Konzentrisch</option>
-            <option value="4">⏹️ Gitter</option>
-            <option value="5">🎲 Zufällig</option>
-            <option value="6">📌 Voreinstellung</option>
-            <option value="7">🔗 COSE (Kraft-basiert)</option>
-        </select>
-        <button onclick="exportImage()">📸 Bild exportieren</button>
-        <button onclick="toggleEditMode()">✏️ Edit-Modus</button>
-    </div>
-    
-    <div id="cy"></div>
-    
-    <div id="info-panel" class="info-panel">
-        <h3>Knoten-Information</h3>
-        <div id="node-info"></div>
-    </div>
+        """Generiert HTML-Template für Cytoscape.js
+        
+        Hält die ganze Seite im Speicher; für große Graphen write_html direkt auf eine
+        Datei verwenden (oder generate_html_bytes, siehe dort).
+        """
+        
+        return self.generate_html_bytes(cytoscape_elements, title).decode('utf-8')
     
-    <div id="edit-controls" class="edit-controls" style="display: none;">
-        <h4>Edit-Modus</h4>
-        <button onclick="addNode()">➕ Knoten hinzufügen</button>
-        <button onclick="addEdge()">🔗 Kante hinzufügen</button>
-        <button onclick="deleteSelected()" class="delete">🗑️ Löschen</button>
-        <button onclick="editSelected()">✏️ Bearbeiten</button>
-        <button onclick="saveGraph()">💾 Speichern</button>
-    </div>
+    def generate_html_bytes(self, cytoscape_elements: List[Dict[str, Any]],
+                            title: str = "Graph Visualisierung") -> bytes:
+        """Generiert die HTML-Seite UTF-8-kodiert
+        
+        Das Template enthält Emojis, als str bräuchte die Seite daher 4 Byte je Zeichen;
+        hier wird stückweise kodiert geschrieben. Gleiche Elemente und Titel liefern die
+        zuletzt erzeugte Seite aus einem kleinen LRU-Cache (Schlüssel: Hash der
+        serialisierten Elemente plus Style, inline_assets und debug, die die Seite ebenfalls
+        bestimmen).
+        """
+        
+        payload = ',\n'.join(map(_json_dumps, cytoscape_elements))
+        key = (title, self.style, self.inline_assets, self.debug,
+               hashlib.blake2b(payload.encode('utf-8'), digest_size=16).digest())
+        
+        html = self._html_cache.get(key)
+        if html is not None:
+            self._html_cache.move_to_end(key)
+            return html
+        
+        buffer = io.BytesIO()
+        text = io.TextIOWrapper(buffer, encoding='utf-8', newline='')
+        self._write_html_document(text, ('[', payload, ']'), title)
+        text.flush()
+        text.detach()
+        html = self._html_cache[key] = buffer.getvalue()
+        if len(self._html_cache) > _HTML_CACHE_SIZE:
+            self._html_cache.popitem(last=False)
+        return html
     
-    <div id="context-menu" class="context-menu">
-        <div class="context-menu-item" onclick="editNode()">Bearbeiten</div>
-        <div class="context-menu-item" onclick="deleteNode()">Löschen</div>
-        <div class="context-menu-item" onclick="addConnection()">Verbindung hinzufügen</div>
-    </div>
+    def write_html(self, f: TextIO, cytoscape_elements: Iterable[Dict[str, Any]],
+                   title: str = "Graph Visualisierung") -> None:
+        """Schreibt die HTML-Seite stückweise in ein Datei-Objekt"""
+        
+        element_chunks = map(_json_dumps, cytoscape_elements)
+        self._write_html_document(f, self._json_array_chunks(element_chunks), title)
     
-    <!-- Modal für Knoten-Bearbeitung -->
-    <div id="node-modal" class="modal">
-        <div class="modal-content">
-            <h3>Knoten bearbeiten</h3>
-            <label>Name:</label>
-            <input type="text" id="node-name" placeholder="Knoten-Name">
-            <label>Typ:</label>
-            <select id="node-type">
-                <option value="objective">Ziel</option>
-                <option value="project">Projekt</option>
-                <option value="task">Aufgabe</option>
-                <option value="actor">Akteur</option>
-                <option value="object">Objekt</option>
-                <option value="knowledge">Wissen</option>
-                <option value="budget">Budget</option>
-            </select>
-            <label>Beschreibung:</label>
-            <textarea id="node-description" placeholder="Beschreibung"></textarea>
-            <label>Geschätzte Stunden:</label>
-            <input type="number" id="node-hours" placeholder="0">
-            <label>Status:</label>
-            <select id="node-status">
-                <option value="pending">Ausstehend</option>
-                <option value="in_progress">In Bearbeitung</option>
-                <option value="completed">Abgeschlossen</option>
-            </select>
-            <div class="modal-buttons">
-                <button onclick="closeModal()">Abbrechen</button>
-                <button onclick="saveNode()">Speichern</button>
-            </div>
-        </div>
-    </div>
+    def _write_html_document(self, f: TextIO, payload_chunks: Iterable[str], title: str) -> None:
+        """Schreibt die HTML-Seite mit stückweise serialisierten Graph-Daten"""
+        
+        head_parts = _inline_script_head_parts() if self.inline_assets else _HTML_HEAD_PARTS
+        f.write(title.join(head_parts))
+        # Daten als <script type="application/json">: '<' nur in Strings möglich, daher
+        # gefahrlos als \u003c escapen (verhindert ein vorzeitiges </script>)
+        f.writelines(chunk.replace('<', '\\u003c') for chunk in payload_chunks)
+        f.write(_build_html_tail(self.style, self.debug))
     
-    <!-- Modal für Kanten-Bearbeitung -->
-    <div id="edge-modal" class="modal">
-        <div class="modal-content">
-            <h3>Kante hinzufügen</h3>
-            <label>Von Knoten:</label>
-            <select id="edge-source"></select>
-            <label>Zu Knoten:</label>
-            <select id="edge-target"></select>
-            <label>Beziehungstyp:</label>
-            <select id="edge-type">
-                <option value="CONTAINS">Enthält</option>
-                <option value="REQUIRES">Benötigt</option>
-                <option value="PRECEDES">Geht voraus</option>
-            </select>
-            <div class="modal-buttons">
-                <button onclick="closeModal()">Abbrechen</button>
-                <button onclick="saveEdge()">Speichern</button>
-            </div>
-        </div>
-    </div>
+    @staticmethod
+    def _json_array_chunks(element_chunks: Iterable[str]) -> Iterator[str]:
+        """Verbindet serialisierte Elemente stückweise zu einem JSON-Array"""
+        
+        yield '['
+        separator = ''
+        for chunk in element_chunks:
+            yield separator
+            yield chunk
+            separator = ',\n'
+        yield ']'
     
-    <div class="legend">
-        <h3>Legende</h3>
-        <div class="legend-item">
-            <div class="legend-color" style="background-color: #FF6B6B;"><i class="fas fa-flag"></i></div>
-            <span>Ziel (Objective)</span>
-        </div>
-        <div class="legend-item">
-            <div class="legend-color" style="background-color: #4ECDC4;"><i class="fas fa-folder"></i></div>
-            <span>Projekt (Project)</span>
-        </div>
-        <div class="legend-item">
-            <div class="legend-color" style="background-color: #45B7D1;"><i class="fas fa-tasks"></i></div>
-            <span>Aufgabe (Task)</span>
-        </div>
-        <div class="legend-item">
-            <div class="legend-color" style="background-color: #96CEB4;"><i class="fas fa-user"></i></div>
-            <span>Akteur (Actor)</span>
-        </div>
-        <div class="legend-item">
-            <div class="legend-color" style="background-color: #FFEAA7;"><i class="fas fa-cube"></i></div>
-            <span>Objekt (Object)</span>
-        </div>
-        <div class="legend-item">
-            <div class="legend-color" style="background-color: #DDA0DD;"><i class="fas fa-book"></i></div>
-            <span>Wissen (Knowledge)</span>
-        </div>
-        <div class="legend-item">
-            <div class="legend-color" style="background-color: #F39C12;"><i class="fas fa-dollar-sign"></i></div>
-            <span>Budget</span>
-        </div>
-        
-        <h4>Kanten (Beziehungen)</h4>
-        <div class="legend-item">
-            <div class="legend-edge" style="background-color: #2C3E50; color: #2C3E50;"></div>
-            <span>Enthält (CONTAINS)</span>
-        </div>
-        <div class="legend-item">
-            <div class="legend-edge" style="background-color: #E74C3C; color: #E74C3C;"></div>
-            <span>Benötigt (REQUIRES)</span>
-        </div>
-        <div class="legend-item">
-            <div class="legend-edge" style="background-color: #9B59B6; color: #9B59B6;"></div>
-            <span>Geht voraus (PRECEDES)</span>
-        </div>
-    </div>
+    def _columnar_chunks(self, graph: nx.DiGraph,
+                         positions: Optional[Dict[Any, Tuple[int, int]]] = None) -> Iterator[str]:
+        """Serialisiert den Graph im Spaltenformat, Spalte für Spalte"""
+        
+        columns = self.networkx_to_cytoscape_columnar(graph, positions)
+        
+        yield f'{{"types":{_json_dumps(columns["types"])}'
+        yield f',"statuses":{_json_dumps(columns["statuses"])}'
+        yield f',"relationships":{_json_dumps(columns["relationships"])}'
+        for section in ("nodes", "edges"):
+            separator = f',"{section}":{{'
+            for name, values in columns[section].items():
+                yield f'{separator}"{name}":{_json_dumps(values)}'
+                separator = ','
+            yield '}'
+        yield f',"next_node_id":{columns["next_node_id"]}}}'
+        
+        # Spaltenlängen statt number_of_edges() (summiert bei DiGraph alle Knotengrade)
+        print(f"Created {len(columns['nodes']['id'])} nodes and {len(columns['edges']['source'])} edges")
     
-    <script>
-        var cy;
-        var currentLayout = 'dagre';
-        var editMode = false;
-        var selectedNode = null;
-        var nextNodeId = 1;
-        
-        document.addEventListener('DOMContentLoaded', function() {{
-            // Register dagre extension
-            if (typeof cytoscape === 'function' && typeof dagre !== 'undefined') {{
-                cytoscape.use(cytoscapeDagre);
-            }}
-            
-            cy = cytoscape({{
-                container: document.getElementById('cy'),
-                
-                elements: {data_json},
-                
-                style: {style_json},
-                
-                layout: {{
-                    name: 'dagre',
-                    directed: true,
-                    padding: 20,
-                    rankDir: 'TB',
-                    ranker: 'longest-path'
-                }}
-            }});
-            
-            console.log('Cytoscape initialized with', cy.nodes().length, 'nodes and', cy.edges().length, 'edges');
-            
-            // Event-Handler für Knoten-Klick
-            cy.on('tap', 'node', function(event) {{
-                var node = event.target;
-                var data = node.data();
-                
-                if (editMode) {{
-                    selectedNode = node;
-                    cy.nodes().removeClass('selected');
-                    node.addClass('selected');
-                }} else {{
-                    var infoPanel = document.getElementById('info-panel');
-                    var nodeInfo = document.getElementById('node-info');
-                    
-                    var html = '<strong>' + data.label + '</strong><br>';
-                    html += 'Typ: ' + data.type + '<br>';
-                    if (data.description) html += 'Beschreibung: ' + data.description + '<br>';
-                    if (data.estimated_hours) html += 'Geschätzte Stunden: ' + data.estimated_hours + '<br>';
-                    if (data.status) html += 'Status: ' + data.status + '<br>';
-                    
-                    nodeInfo.innerHTML = html;
-                    infoPanel.style.display = 'block';
-                }}
-            }});
-            
-            // Event-Handler für Hintergrund-Klick
-            cy.on('tap', function(event) {{
-                if (event.target === cy) {{
-                    document.getElementById('info-panel').style.display = 'none';
-                    hideContextMenu();
-                    if (editMode) {{
-                        selectedNode = null;
-                        cy.nodes().removeClass('selected');
-                    }}
-                }}
-            }});
-            
-            // Rechtsklick für Context-Menu
-            cy.on('cxttap', 'node', function(event) {{
-                if (editMode) {{
-                    selectedNode = event.target;
-                    showContextMenu(event.renderedPosition || event.position);
-                }}
-            }});
-            
-            // Tooltip für Node-Hover
-            cy.on('mouseover', 'node', function(event) {{
-                var node = event.target;
-                var pos = node.renderedPosition();
-                var label = node.data('label');
-                
-                // Erstelle Tooltip
-                var tooltip = document.createElement('div');
-                tooltip.id = 'node-tooltip';
-                tooltip.innerHTML = label;
-                tooltip.style.cssText = `
-                    position: absolute;
-                    background: #333;
-                    color: white;
-                    padding: 5px 10px;
-                    border-radius: 3px;
-                    font-size: 12px;
-                    z-index: 1000;
-                    pointer-events: none;
-                    left: ${{pos.x + 20}}px;
-                    top: ${{pos.y - 30}}px;
-                `;
-                
-                document.body.appendChild(tooltip);
-            }});
-            
-            cy.on('mouseout', 'node', function(event) {{
-                var tooltip = document.getElementById('node-tooltip');
-                if (tooltip) {{
-                    tooltip.remove();
-                }}
-            }});
-        }});
-        
-        function resetView() {{
-            cy.fit();
-            cy.center();
-        }}
-        
-        function fitToScreen() {{
-            cy.fit();
-        }}
-        
-        var layouts = [
-            {{
-                name: 'dagre',
-                title: 'Dagre (Hierarchisch)',
-                options: {{
-                    name: 'dagre',
-                    directed: true,
-                    padding: 20,
-                    rankDir: 'TB',
-                    ranker: 'longest-path'
-                }}
-            }},
-            {{
-                name: 'breadthfirst',
-                title: 'Breadth-First (Baum)',
-                options: {{
-                    name: 'breadthfirst',
-                    directed: true,
-                    padding: 20,
-                    spacingFactor: 1.2
-                }}
-            }},
-            {{
-                name: 'circle',
-                title: 'Kreis',
-                options: {{
-                    name: 'circle',
-                    padding: 20,
-                    radius: 200
-                }}
-            }},
-            {{
-                name: 'concentric',
-                title: 'Konzentrisch',
-                options: {{
-                    name: 'concentric',
-                    padding: 20,
-                    minNodeSpacing: 50,
-                    concentric: function(node) {{
-                        return node.degree();
-                    }}
-                }}
-            }},
-            {{
-                name: 'grid',
-                title: 'Gitter',
-                options: {{
-                    name: 'grid',
-                    padding: 20,
-                    rows: undefined,
-                    cols: undefined
-                }}
-            }},
-            {{
-                name: 'random',
-                title: 'Zufällig',
-                options: {{
-                    name: 'random',
-                    padding: 20
-                }}
-            }},
-            {{
-                name: 'preset',
-                title: 'Voreinstellung',
-                options: {{
-                    name: 'preset',
-                    padding: 20
-                }}
-            }},
-            {{
-                name: 'cose',
-                title: 'COSE (Kraft-basiert)',
-                options: {{
-                    name: 'cose',
-                    padding: 20,
-                    nodeRepulsion: 400000,
-                    nodeOverlap: 10,
-                    idealEdgeLength: 100,
-                    edgeElasticity: 100,
-                    nestingFactor: 5,
-                    gravity: 80,
-                    numIter: 1000,
-                    initialTemp: 200,
-                    coolingFactor: 0.95,
-                    minTemp: 1.0
-                }}
-            }}
-        ];
-        
-        var currentLayoutIndex = 0;
-        
-        function changeLayout() {{
-            var select = document.getElementById('layout-select');
-            var layoutIndex = parseInt(select.value);
-            var layout = layouts[layoutIndex];
-            
-            console.log('Wechsle zu Layout:', layout.title);
-            
-            try {{
-                cy.layout(layout.options).run();
-                currentLayout = layout.name;
-                currentLayoutIndex = layoutIndex;
-            }} catch (error) {{
-                console.error('Layout-Fehler:', error);
-                // Fallback zu dagre
-                cy.layout({{
-                    name: 'dagre',
-                    directed: true,
-                    padding: 20,
-                    rankDir: 'TB'
-                }}).run();
-            }}
-        }}
-        
-        function toggleLayout() {{
-            currentLayoutIndex = (currentLayoutIndex + 1) % layouts.length;
-            var select = document.getElementById('layout-select');
-            select.value = currentLayoutIndex;
-            changeLayout();
-        }}
-        
-        // Fallback if dagre doesn't work
-        function fallbackLayout() {{
-            if (cy.nodes().length === 0) {{
-                console.error('No nodes found in graph');
-                return;
-            }}
-            
-            cy.layout({{
-                name: 'breadthfirst',
-                directed: true,
-                padding: 20
-            }}).run();
-        }}
-        
-        // Try fallback after 2 seconds if graph is empty
-        setTimeout(function() {{
-            if (cy && cy.nodes().length === 0) {{
-                console.log('No nodes detected, trying fallback...');
-                fallbackLayout();
-            }}
-        }}, 2000);
-        
-        function exportImage() {{
-            var png64 = cy.png({{
-                output: 'base64uri',
-                bg: 'white',
-                full: true,
-                scale: 2
-            }});
-            
-            var link = document.createElement('a');
-            link.download = 'graph.png';
-            link.href = png64;
-            link.click();
-        }}
-        
-        // Edit-Modus Funktionen
-        function toggleEditMode() {{
-            editMode = !editMode;
-            var editControls = document.getElementById('edit-controls');
-            var button = event.target;
-            
-            if (editMode) {{
-                editControls.style.display = 'block';
-                button.textContent = '👀 Ansicht-Modus';
-                button.style.backgroundColor = '#E74C3C';
-            }} else {{
-                editControls.style.display = 'none';
-                button.textContent = '✏️ Edit-Modus';
-                button.style.backgroundColor = '#4ECDC4';
-                selectedNode = null;
-                cy.nodes().removeClass('selected');
-            }}
-        }}
-        
-        function addNode() {{
-            document.getElementById('node-modal').style.display = 'block';
-            document.getElementById('node-name').value = '';
-            document.getElementById('node-type').value = 'task';
-            document.getElementById('node-description').value = '';
-            document.getElementById('node-hours').value = '';
-            document.getElementById('node-status').value = 'pending';
-        }}
-        
-        function editSelected() {{
-            if (!selectedNode) {{
-                alert('Bitte wählen Sie einen Knoten aus.');
-                return;
-            }}
-            
-            var data = selectedNode.data();
-            document.getElementById('node-modal').style.display = 'block';
-            document.getElementById('node-name').value = data.label || '';
-            document.getElementById('node-type').value = data.type || 'task';
-            document.getElementById('node-description').value = data.description || '';
-            document.getElementById('node-hours').value = data.estimated_hours || '';
-            document.getElementById('node-status').value = data.status || 'pending';
-        }}
-        
-        function deleteSelected() {{
-            if (!selectedNode) {{
-                alert('Bitte wählen Sie einen Knoten aus.');
-                return;
-            }}
-            
-            if (confirm('Knoten wirklich löschen?')) {{
-                cy.remove(selectedNode);
-                selectedNode = null;
-            }}
-        }}
-        
-        function addEdge() {{
-            populateNodeSelects();
-            document.getElementById('edge-modal').style.display = 'block';
-        }}
-        
-        function saveNode() {{
-            var name = document.getElementById('node-name').value;
-            var type = document.getElementById('node-type').value;
-            var description = document.getElementById('node-description').value;
-            var hours = document.getElementById('node-hours').value;
-            var status = document.getElementById('node-status').value;
-            
-            if (!name) {{
-                alert('Bitte geben Sie einen Namen ein.');
-                return;
-            }}
-            
-            var nodeData = {{
-                label: name,
-                type: type,
-                description: description,
-                estimated_hours: hours ? parseInt(hours) : 0,
-                status: status,
-                icon: getIconForType(type)
-            }};
-            
-            if (selectedNode) {{
-                // Bearbeitung
-                selectedNode.data(nodeData);
-            }} else {{
-                // Neuer Knoten
-                var nodeId = 'node_' + nextNodeId++;
-                nodeData.id = nodeId;
-                
-                cy.add({{
-                    data: nodeData,
-                    classes: type
-                }});
-            }}
-            
-            closeModal();
-        }}
+    def create_visualization(self, graph: nx.DiGraph, output_file: str = "graph_cytoscape.html",
+                           title: str = "Graph Visualisierung", open_browser: bool = True,
+                           external_data: bool = False, precompute_layout: bool = False) -> str:
+        """Erstellt komplette Cytoscape.js-Visualisierung
         
-        function saveEdge() {{
-            var source = document.getElementById('edge-source').value;
-            var target = document.getElementById('edge-target').value;
-            var type = document.getElementById('edge-type').value;
-            
-            if (!source || !target) {{
-                alert('Bitte wählen Sie Quell- und Zielknoten aus.');
-                return;
-            }}
-            
-            if (source === target) {{
-                alert('Quell- und Zielknoten müssen unterschiedlich sein.');
-                return;
-            }}
-            
-            var edgeId = source + '-' + target;
-            
-            cy.add({{
-                data: {{
-                    id: edgeId,
-                    source: source,
-                    target: target,
-                    relationship: type
-                }},
-                classes: type
-            }});
-            
-            closeModal();
-        }}
-        
-        function closeModal() {{
-            document.getElementById('node-modal').style.display = 'none';
-            document.getElementById('edge-modal').style.display = 'none';
-        }}
-        
-        function showContextMenu(position) {{
-            var menu = document.getElementById('context-menu');
-            menu.style.left = position.x + 'px';
-            menu.style.top = position.y + 'px';
-            menu.style.display = 'block';
-        }}
-        
-        function hideContextMenu() {{
-            document.getElementById('context-menu').style.display = 'none';
-        }}
-        
-        function editNode() {{
-            hideContextMenu();
-            editSelected();
-        }}
-        
-        function deleteNode() {{
-            hideContextMenu();
-            deleteSelected();
-        }}
-        
-        function addConnection() {{
-            hideContextMenu();
-            addEdge();
-        }}
-        
-        function populateNodeSelects() {{
-            var sourceSelect = document.getElementById('edge-source');
-            var targetSelect = document.getElementById('edge-target');
-            
-            sourceSelect.innerHTML = '';
-            targetSelect.innerHTML = '';
-            
-            cy.nodes().forEach(function(node) {{
-                var option = document.createElement('option');
-                option.value = node.id();
-                option.textContent = node.data('label');
-                sourceSelect.appendChild(option.cloneNode(true));
-                targetSelect.appendChild(option);
-            }});
-        }}
-        
-        function getIconForType(type) {{
-            var iconMap = {{
-                'objective': '\\f3a5',
-                'project': '\\f07b',
-                'task': '\\f0ae',
-                'actor': '\\f007',
-                'object': '\\f1b2',
-                'knowledge': '\\f02d',
-                'budget': '\\f155'
-            }};
-            return iconMap[type] || '\\f128';
-        }}
-        
-        function saveGraph() {{
-            var elements = cy.elements().jsons();
-            var graphData = {{
-                elements: elements,
-                timestamp: new Date().toISOString()
-            }};
-            
-            var dataStr = JSON.stringify(graphData, null, 2);
-            var dataBlob = new Blob([dataStr], {{type: 'application/json'}});
-            
-            var link = document.createElement('a');
-            link.download = 'edited_graph.json';
-            link.href = URL.createObjectURL(dataBlob);
-            link.click();
-            
-            console.log('Graph gespeichert:', graphData);
-        }}
+        Mit external_data=True landen die Graph-Daten in <output_file>.elements.json und
+        die Seite lädt sie per fetch() nach (kleines HTML, Daten separat cachebar). Das
+        setzt Auslieferung über HTTP voraus; über file:// blockieren Browser den fetch().
         
-        // Modal schließen bei Klick außerhalb
-        window.onclick = function(event) {{
-            var nodeModal = document.getElementById('node-modal');
-            var edgeModal = document.getElementById('edge-modal');
-            
-            if (event.target === nodeModal) {{
-                nodeModal.style.display = 'none';
-            }}
-            if (event.target === edgeModal) {{
-                edgeModal.style.display = 'none';
-            }}
-        }}
-        
-        // Finde höchste Node-ID für nextNodeId
-        document.addEventListener('DOMContentLoaded', function() {{
-            setTimeout(function() {{
-                var maxId = 0;
-                cy.nodes().forEach(function(node) {{
-                    var id = node.id();
-                    if (id.startsWith('node_')) {{
-                        var num = parseInt(id.substring(5));
-                        if (num > maxId) maxId = num;
-                    }}
-                }});
-                nextNodeId = maxId + 1;
-            }}, 100);
-        }});
-    </script>
-</body>
-</html>
-"""
-        return html_template
-    
-    def create_visualization(self, graph: nx.DiGraph, output_file: str = "graph_cytoscape.html",
-                           title: str = "Graph Visualisierung", open_browser: bool = True) -> str:
-        """Erstellt komplette Cytoscape.js-Visualisierung"""
+        Mit precompute_layout=True werden die Knotenpositionen hier berechnet (hierarchisch
+        wie dagre) und mitgeliefert; der Browser überspringt das Layout beim Laden.
+        """
         
-        # NetworkX zu Cytoscape konvertieren
-        cytoscape_elements = self.networkx_to_cytoscape(graph)
+        positions = _layered_positions(graph) if precompute_layout else None
         
-        # HTML generieren
-        html_content = self.generate_html_template(cytoscape_elements, title)
+        # NetworkX zu Cytoscape konvertieren (Spaltenformat, wird beim Schreiben erzeugt)
+        payload_chunks = self._columnar_chunks(graph, positions)
         
-        # Datei schreiben
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        if external_data:
+            data_file = output_file + ".elements.json"
+            with open(data_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                f.writelines(payload_chunks)
+            _write_gzip_copy(data_file)
+            payload_chunks = [_json_dumps({"src": os.path.basename(data_file)})]
         
-        print(f"🌐 Cytoscape.js-Visualisierung erstellt: {output_file}")
+        # HTML direkt in die Datei schreiben (1 MiB Puffer)
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            self._write_html_document(f, payload_chunks, title)
+        gzip_file = _write_gzip_copy(output_file)
+        
+        print(f"🌐 Cytoscape.js-Visualisierung erstellt: {output_file} (komprimiert: {gzip_file})")
         
         # Browser öffnen
         if open_browser:
+            import webbrowser
             file_path = os.path.abspath(output_file)
             webbrowser.open(f"file://{file_path}")
         
         return output_file
     
+    def create_visualizations_bulk(self, jobs: Iterable[Tuple[nx.DiGraph, str]],
+                                   title: str = "Graph Visualisierung",
+                                   max_workers: Optional[int] = None) -> List[Optional[str]]:
+        """Erstellt mehrere Visualisierungen (Graph, Ausgabedatei) parallel in eigenen Prozessen"""
+        
+        from concurrent.futures import ProcessPoolExecutor
+        
+        tasks = [(self.style, self.inline_assets, self.debug, graph, output_file, title)
+                 for graph, output_file in jobs]
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            return list(executor.map(_render_one, tasks, chunksize=4))
+    
     def export_cytoscape_json(self, graph: nx.DiGraph, output_file: str = "graph_cytoscape.json") -> str:
         """Exportiert Graph als Cytoscape.js-JSON"""
         
-        cytoscape_elements = self.networkx_to_cytoscape(graph)
+        element_chunks = map(_json_dumps, self._iter_cytoscape(graph))
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(cytoscape_elements, f, indent=2, ensure_ascii=False)
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.writelines(self._json_array_chunks(element_chunks))
         
         print(f"💾 Cytoscape.js-JSON exportiert: {output_file}")
         return output_file
     
+    def export_cytoscape_columnar(self, graph: nx.DiGraph,
+                                  output_file: str = "graph_cytoscape_columnar.json") -> str:
+        """Exportiert Graph im kompakten Spaltenformat (siehe networkx_to_cytoscape_columnar)"""
+        
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.writelines(self._columnar_chunks(graph))
+        
+        print(f"💾 Cytoscape.js-Spalten-JSON exportiert: {output_file}")
+        return output_file
+    
     def create_visualization_from_cytoscape(self, elements: List[Dict[str, Any]], 
                                           output_file: str = "graph_cytoscape.html",
                                           title: str = "Editierter Graph", 
                                           open_browser: bool = True) -> str:
         """Erstellt Cytoscape.js-Visualisierung direkt aus Cytoscape-Elementen"""
         
-        # HTML generieren
-        html_content = self.generate_html_template(elements, title)
+        # HTML direkt in die Datei schreiben (1 MiB Puffer)
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            self.write_html(f, elements, title)
+        gzip_file = _write_gzip_copy(output_file)
         
-        # Datei schreiben
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        print(f"🌐 Cytoscape.js-Visualisierung aus editiertem Graph erstellt: {output_file}")
+        print(f"🌐 Cytoscape.js-Visualisierung aus editiertem Graph erstellt: {output_file} (komprimiert: {gzip_file})")
         
         # Browser öffnen
         if open_browser:
+            import webbrowser
             file_path = os.path.abspath(output_file)
             webbrowser.open(f"file://{file_path}")
         
         return output_file
 
 
-def load_cytoscape_from_file(filepath: str) -> List[Dict[str, Any]]:
-    """Lädt eine editierte Cytoscape.js-JSON-Datei"""
+def _render_one(task: Tuple[CytoscapeStyle, bool, bool, nx.DiGraph, str, str]) -> Optional[str]:
+    """Worker für create_visualizations_bulk (modulweit, damit picklebar)"""
+    style, inline_assets, debug, graph, output_file, title = task
+    try:
+        visualizer = CytoscapeVisualizer(style, inline_assets=inline_assets, debug=debug)
+        return visualizer.create_visualization(graph, output_file, title, open_browser=False)
+    except Exception as e:
+        print(f"❌ Fehler bei der Visualisierung von {output_file}: {e}")
+        return None
+
+
+@lru_cache(maxsize=1)
+def _inline_script_head_parts() -> Tuple[str, ...]:
+    """HTML-Kopf (am Titel geteilt) mit eingebetteten JS-Bibliotheken (fehlende Dateien bleiben CDN-Links)"""
+    html_head = _HTML_HEAD
+    for filename, url in _SCRIPT_ASSETS.items():
+        asset_path = _ASSETS_DIR / filename
+        if not asset_path.exists():
+            print(f"⚠️ Asset nicht gefunden, verwende CDN: {asset_path}")
+            continue
+        script = asset_path.read_text(encoding='utf-8').replace('</script', '<\\/script')
+        # Eingebettete Skripte laufen sofort; ein defer-Attribut entfällt dabei
+        html_head = re.sub(f'<script src="{re.escape(url)}"( defer)?></script>',
+                           lambda _: f'<script>{script}</script>', html_head)
+    return tuple(html_head.split("{{TITLE}}"))
+
+
+def download_assets(target_dir: Path = _ASSETS_DIR) -> bool:
+    """Lädt die JS-Bibliotheken einmalig nach assets/ (Voraussetzung für inline_assets=True)"""
+    import urllib.request
+    try:
+        target_dir.mkdir(parents=True, exist_ok=True)
+        for filename, url in _SCRIPT_ASSETS.items():
+            with urllib.request.urlopen(url, timeout=30) as response:
+                (target_dir / filename).write_bytes(response.read())
+            print(f"✅ Asset geladen: {filename}")
+        _inline_script_head_parts.cache_clear()
+        return True
+    except Exception as e:
+        print(f"❌ Fehler beim Laden der Assets: {e}")
+        return False
+
+
+def _write_gzip_copy(filepath: str) -> str:
+    """Legt neben der Datei eine gzip-komprimierte Kopie (<datei>.gz) an"""
+    gzip_file = filepath + ".gz"
+    with open(filepath, 'rb') as src, gzip.open(gzip_file, 'wb', compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+    return gzip_file
+
+
+def load_cytoscape_from_file(filepath: str, streaming: bool = False) -> List[Dict[str, Any]]:
+    """Lädt eine editierte Cytoscape.js-JSON-Datei
+    
+    Mit streaming=True werden die Elemente per ijson einzeln gelesen, ohne den
+    gesamten Dateiinhalt und das komplette Objekt gleichzeitig im Speicher.
+    """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if streaming:
+            try:
+                import ijson
+            except ImportError:
+                print("⚠️ ijson nicht installiert - lade Datei vollständig (pip install ijson)")
+            else:
+                with open(filepath, 'rb') as f:
+                    elements = list(ijson.items(f, 'elements.item', use_float=True))
+                if elements:
+                    print(f"✅ Cytoscape-Graph gestreamt: {len(elements)} Elemente")
+                else:
+                    print("⚠️ Nicht als Cytoscape-Graph erkannt, versuche als Plan-Datei...")
+                return elements
+        
+        with open(filepath, 'rb') as f:
+            data = _json_loads(f.read())
         
         # Prüfe ob es eine editierte Graph-Datei ist
         if 'elements' in data and isinstance(data['elements'], list):
@@ -1214,6 +760,7 @@ def create_test_graph() -> nx.DiGraph:
 
 def main():
     """Hauptfunktion für Cytoscape.js-Visualisierung"""
+    from Plan2Graph import PlanGraphConverter, load_plan_from_file, get_sample_plan
     print("🌐 Cytoscape.js Graph Visualisierung")
     print("=" * 40)
     
@@ -1262,7 +809,7 @@ def main():
             return
         
         print(f"📄 Lade editierten Graph aus {filepath}...")
-        elements = load_cytoscape_from_file(filepath)
+        elements = load_cytoscape_from_file(filepath, streaming=True)
         
         if not elements:
             print("❌ Konnte editierten Graph nicht laden!")
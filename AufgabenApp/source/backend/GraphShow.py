@@ -6,15 +6,41 @@ Stellt verschiedene Methoden zur Darstellung von Projekt-Graphen bereit
 
 import networkx as nx
 import matplotlib.pyplot as plt
+from matplotlib.lines import Line2D
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import numpy as np
 from typing import Dict, Any, Tuple, List, Optional
 import json
+from collections import OrderedDict, defaultdict
 from dataclasses import dataclass
 from Plan2Graph import PlanGraphConverter, load_plan_from_file, get_sample_plan
 
+# Optionale Layout-Backends (einmal beim Import geprüft): igraph vor Graphviz vor NetworkX
+try:
+    import igraph as ig
+    _HAS_IGRAPH = True
+except ImportError:
+    ig = None
+    _HAS_IGRAPH = False
+
+try:
+    import pygraphviz  # noqa: F401 - nur Verfügbarkeit für nx.nx_agraph prüfen
+    _HAS_PYGRAPHVIZ = True
+except ImportError:
+    _HAS_PYGRAPHVIZ = False
+
+# Anzahl zwischengespeicherter Layouts je Visualizer (älteste werden verworfen)
+_LAYOUT_CACHE_SIZE = 8
+
+# Bis zu dieser Kantenzahl zeichnet Matplotlib Pfeilspitzen (ein Patch je Kante),
+# darüber eine einzige LineCollection ohne Pfeile
+_MAX_ARROW_EDGES = 1000
+
+# Ab dieser Knotenzahl nutzt "spring" ForceAtlas2 (Barnes-Hut, O(n log n)), falls fa2 installiert
+_FORCEATLAS2_MIN_NODES = 200
+
 
 @dataclass
 class GraphStyle:
@@ -58,6 +84,12 @@ class GraphVisualizer:
     
     def __init__(self, style: Optional[GraphStyle] = None):
         self.style = style if style else GraphStyle.default()
+        # Layout-Positionen je (Layout, Graph-Signatur), z.B. für Matplotlib + Plotly
+        self._layout_cache: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        # Zuletzt berechneter Cache-Schlüssel je Layout: (Graph, Knoten-/Kantenzahl, Schlüssel)
+        self._layout_keys: Dict[str, Tuple[nx.DiGraph, Tuple[int, int], Tuple]] = {}
+        # Letzte Gruppierung: (Graph, Knoten-/Kantenzahl, Knoten je Typ, Kanten je Beziehung)
+        self._group_cache: Optional[Tuple[nx.DiGraph, Tuple[int, int], Dict, Dict]] = None
         
     def show_matplotlib(self, graph: nx.DiGraph, layout: str = "spring", 
                        figsize: Tuple[int, int] = (15, 10), 
@@ -69,46 +101,57 @@ class GraphVisualizer:
         # Layout berechnen
         pos = self._get_layout(graph, layout)
         
-        # Knoten nach Typ gruppieren
-        node_groups = self._group_nodes_by_type(graph)
+        # Knoten nach Typ, Kanten nach Beziehungstyp gruppieren
+        node_groups, edge_groups = self._get_groups(graph)
         
-        # Knoten zeichnen
+        # Alle Knoten in einem Aufruf (eine PathCollection) mit Farbe/Größe je Knoten
+        nodelist, node_colors, node_sizes, legend_handles = [], [], [], []
         for node_type, nodes in node_groups.items():
-            if nodes:
-                nx.draw_networkx_nodes(
-                    graph, pos, 
-                    nodelist=nodes,
-                    node_color=self.style.node_colors.get(node_type, "#CCCCCC"),
-                    node_size=self.style.node_sizes.get(node_type, 500),
-                    alpha=0.8,
-                    label=node_type.capitalize()
-                )
-        
-        # Kanten nach Beziehungstyp zeichnen
-        edge_groups = self._group_edges_by_relationship(graph)
-        
+            color = self.style.node_colors.get(node_type, "#CCCCCC")
+            nodelist.extend(nodes)
+            node_colors.extend([color] * len(nodes))
+            node_sizes.extend([self.style.node_sizes.get(node_type, 500)] * len(nodes))
+            legend_handles.append(Line2D([], [], marker='o', linestyle='', markersize=10,
+                                         markerfacecolor=color, markeredgecolor=color, alpha=0.8,
+                                         label=node_type.capitalize()))
+        
+        if nodelist:
+            nx.draw_networkx_nodes(graph, pos, nodelist=nodelist, node_color=node_colors,
+                                   node_size=node_sizes, alpha=0.8)
+        
+        # Alle Kanten in einem Aufruf, Farbe je Beziehungstyp
+        edgelist, edge_colors = [], []
         for relationship, edges in edge_groups.items():
-            if edges:
-                nx.draw_networkx_edges(
-                    graph, pos,
-                    edgelist=edges,
-                    edge_color=self.style.edge_colors.get(relationship, "#CCCCCC"),
-                    alpha=0.6,
-                    arrows=True,
-                    arrowsize=20,
-                    width=2
-                )
-        
-        # Labels hinzufügen
-        labels = {node: data.get("name", node)[:20] + "..." 
-                 if len(data.get("name", node)) > 20 
-                 else data.get("name", node)
-                 for node, data in graph.nodes(data=True)}
+            edgelist.extend(edges)
+            edge_colors.extend([self.style.edge_colors.get(relationship, "#CCCCCC")] * len(edges))
+        
+        if len(edgelist) > _MAX_ARROW_EDGES:
+            nx.draw_networkx_edges(graph, pos, edgelist=edgelist, edge_color=edge_colors,
+                                   alpha=0.6, width=2, arrows=False)
+        elif edgelist:
+            nx.draw_networkx_edges(
+                graph, pos,
+                edgelist=edgelist,
+                edge_color=edge_colors,
+                alpha=0.6,
+                arrows=True,
+                arrowsize=20,
+                width=2,
+                # Pfeilspitzen am Rand des jeweiligen Knotens enden lassen
+                nodelist=nodelist,
+                node_size=node_sizes
+            )
+        
+        # Labels hinzufügen (Name je Knoten nur einmal nachschlagen)
+        labels = {}
+        for node, data in graph.nodes(data=True):
+            name = data.get("name", node)
+            labels[node] = name[:20] + "..." if len(name) > 20 else name
         
         nx.draw_networkx_labels(graph, pos, labels, font_size=8, font_weight="bold")
         
         plt.title("Projekt-Graph Visualisierung", size=16, weight="bold")
-        plt.legend(scatterpoints=1, loc="upper left", bbox_to_anchor=(1, 1))
+        plt.legend(handles=legend_handles, loc="upper left", bbox_to_anchor=(1, 1))
         plt.axis("off")
         plt.tight_layout()
         
@@ -125,20 +168,29 @@ class GraphVisualizer:
         # Layout berechnen
         pos = self._get_layout(graph, layout)
         
+        # Positionen einmal als Array, Kanten dann per Index-Gather
+        node_index = {node: i for i, node in enumerate(graph)}
+        positions = np.array([pos[node] for node in graph], dtype=float).reshape(-1, 2)
+        
+        node_groups, edge_groups = self._get_groups(graph)
+        
         # Kanten-Traces
         edge_traces = []
-        edge_groups = self._group_edges_by_relationship(graph)
         
         for relationship, edges in edge_groups.items():
             if not edges:
                 continue
-                
-            edge_x, edge_y = [], []
-            for edge in edges:
-                x0, y0 = pos[edge[0]]
-                x1, y1 = pos[edge[1]]
-                edge_x.extend([x0, x1, None])
-                edge_y.extend([y0, y1, None])
+            
+            sources = np.fromiter((node_index[edge[0]] for edge in edges), dtype=np.intp, count=len(edges))
+            targets = np.fromiter((node_index[edge[1]] for edge in edges), dtype=np.intp, count=len(edges))
+            
+            # Je Kante (x0, x1, NaN): NaN trennt die Liniensegmente wie zuvor None
+            edge_x = np.full(len(edges) * 3, np.nan)
+            edge_y = np.full(len(edges) * 3, np.nan)
+            edge_x[0::3] = positions[sources, 0]
+            edge_x[1::3] = positions[targets, 0]
+            edge_y[0::3] = positions[sources, 1]
+            edge_y[1::3] = positions[targets, 1]
             
             edge_trace = go.Scatter(
                 x=edge_x, y=edge_y,
@@ -152,19 +204,20 @@ class GraphVisualizer:
         
         # Knoten-Traces
         node_traces = []
-        node_groups = self._group_nodes_by_type(graph)
         
         for node_type, nodes in node_groups.items():
             if not nodes:
                 continue
-                
-            node_x = [pos[node][0] for node in nodes]
-            node_y = [pos[node][1] for node in nodes]
+            
+            # Koordinaten per Index aus dem Positions-Array (wie bei den Kanten)
+            indices = np.fromiter((node_index[node] for node in nodes), dtype=np.intp, count=len(nodes))
+            node_x = positions[indices, 0]
+            node_y = positions[indices, 1]
             
             # Hover-Informationen
             hover_text = []
             for node in nodes:
-                data = graph.nodes[node]
+                data = graph._node[node]
                 text = f"<b>{data.get('name', 'Unbekannt')}</b><br>"
                 text += f"Typ: {node_type}<br>"
                 if data.get('description'):
@@ -182,7 +235,8 @@ class GraphVisualizer:
                 text=hover_text,
                 textposition="middle center",
                 marker=dict(
-                    size=[self.style.node_sizes.get(node_type, 500) / 30 for _ in nodes],
+                    # Eine Größe je Typ: Skalar statt Liste mit identischen Werten
+                    size=self.style.node_sizes.get(node_type, 500) / 30,
                     color=self.style.node_colors.get(node_type, "#CCCCCC"),
                     line=dict(width=2, color="black")
                 ),
@@ -221,75 +275,199 @@ class GraphVisualizer:
     def create_hierarchical_view(self, graph: nx.DiGraph) -> go.Figure:
         """Erstellt hierarchische Baum-Ansicht"""
         
-        # Hierarchie-Layout für bessere Darstellung
-        pos = nx.nx_agraph.graphviz_layout(graph, prog='dot') if hasattr(nx, 'nx_agraph') else self._get_layout(graph, "hierarchical")
-        
-        # Ebenen identifizieren
-        levels = {}
-        for node, data in graph.nodes(data=True):
-            node_type = data.get('node_type', data.get('resource_type', 'unknown'))
-            if node_type == 'objective':
-                levels[node] = 0
-            elif node_type == 'project':
-                levels[node] = 1
-            elif node_type == 'task':
-                levels[node] = 2
-            else:
-                levels[node] = 3
-        
-        # Positionen nach Ebenen anordnen
-        pos_hierarchical = {}
-        level_counts = {}
-        
-        for node, level in levels.items():
-            if level not in level_counts:
-                level_counts[level] = 0
-            
-            x = level_counts[level] * 200
-            y = -level * 150
-            pos_hierarchical[node] = (x, y)
-            level_counts[level] += 1
-        
-        return self.show_plotly_interactive(graph, layout="custom")
+        # Backend-Auswahl (igraph/Graphviz/nach Knotentyp) siehe _layered_layout
+        return self.show_plotly_interactive(graph, layout="hierarchical")
     
     def export_graph_stats(self, graph: nx.DiGraph) -> Dict[str, Any]:
         """Exportiert Graph-Statistiken"""
         
-        node_types = {}
-        for _, data in graph.nodes(data=True):
-            node_type = data.get('node_type', data.get('resource_type', 'unknown'))
-            node_types[node_type] = node_types.get(node_type, 0) + 1
-        
-        relationship_types = {}
-        for _, _, data in graph.edges(data=True):
-            rel_type = data.get('relationship', 'unknown')
-            relationship_types[rel_type] = relationship_types.get(rel_type, 0) + 1
+        node_groups, edge_groups = self._get_groups(graph)
         
         return {
             "total_nodes": graph.number_of_nodes(),
             "total_edges": graph.number_of_edges(),
-            "node_types": node_types,
-            "relationship_types": relationship_types,
+            "node_types": {node_type: len(nodes) for node_type, nodes in node_groups.items()},
+            "relationship_types": {rel_type: len(edges) for rel_type, edges in edge_groups.items()},
             "graph_density": nx.density(graph),
             "is_connected": nx.is_weakly_connected(graph),
             "number_of_components": nx.number_weakly_connected_components(graph)
         }
     
+    def invalidate_layout(self) -> None:
+        """Verwirft alle zwischengespeicherten Layouts und Gruppierungen"""
+        self._layout_cache.clear()
+        self._layout_keys.clear()
+        self._group_cache = None
+    
     def _get_layout(self, graph: nx.DiGraph, layout: str) -> Dict:
+        """Liefert Layout-Positionen (gleicher Graph + Layout: aus dem Cache)
+        
+        Derselbe Graph mit unveränderter Knoten-/Kantenzahl gilt als unverändert. Wird er
+        in-place geändert, ohne dass sich die Anzahlen ändern (z.B. node_type), muss der
+        Aufrufer invalidate_layout() aufrufen. Der Cache hält Tupel, zurückgegeben wird
+        ein neues Dict: Änderungen des Aufrufers erreichen den Cache nicht.
+        """
+        
+        signature = (graph.number_of_nodes(), graph.number_of_edges())
+        last = self._layout_keys.get(layout)
+        if last is not None and last[0] is graph and last[1] == signature:
+            key = last[2]
+        else:
+            key = (layout, *signature, self._graph_fingerprint(graph, layout))
+            self._layout_keys[layout] = (graph, signature, key)
+        
+        pos = self._layout_cache.get(key)
+        if pos is not None:
+            self._layout_cache.move_to_end(key)
+            return dict(pos)
+        
+        pos = self._layout_cache[key] = {
+            node: tuple(float(c) for c in xy)
+            for node, xy in self._compute_layout(graph, layout).items()
+        }
+        if len(self._layout_cache) > _LAYOUT_CACHE_SIZE:
+            self._layout_cache.popitem(last=False)
+        return dict(pos)
+    
+    @staticmethod
+    def _graph_fingerprint(graph: nx.DiGraph, layout: str) -> Tuple[int, int]:
+        """Hash über Knoten und Kanten; beim hierarchischen Layout inkl. Knotentyp"""
+        if layout == "hierarchical":
+            # _hierarchical_layout ordnet die Ebenen nach node_type/resource_type
+            nodes = frozenset(
+                (node, data.get('node_type', data.get('resource_type')))
+                for node, data in graph.nodes(data=True))
+        else:
+            nodes = frozenset(graph.nodes())
+        return hash(nodes), hash(frozenset(graph.edges()))
+    
+    def _compute_layout(self, graph: nx.DiGraph, layout: str) -> Dict:
         """Berechnet Layout-Positionen"""
         
+        # Fester Seed: gleiche Positionen bei jedem Aufruf (cachebar, reproduzierbar)
         layouts = {
-            "spring": lambda g: nx.spring_layout(g, k=3, iterations=50),
+            "spring": lambda g: self._spring_layout(g),
+            "forceatlas2": lambda g: self._forceatlas2_layout(g) or self._spring_layout(g),
+            "lbfgs": lambda g: self._lbfgs_layout(g) or self._spring_layout(g),
             "circular": lambda g: nx.circular_layout(g),
             "random": lambda g: nx.random_layout(g),
             "shell": lambda g: nx.shell_layout(g),
-            "hierarchical": lambda g: self._hierarchical_layout(g)
+            "hierarchical": lambda g: self._layered_layout(g)
         }
         
         if layout in layouts:
             return layouts[layout](graph)
         else:
-            return nx.spring_layout(graph, k=3, iterations=50)
+            return self._spring_layout(graph)
+    
+    def _spring_layout(self, graph: nx.DiGraph) -> Dict:
+        """Kräftebasiertes Layout: große Graphen per ForceAtlas2, sonst NetworkX spring_layout"""
+        if graph.number_of_nodes() > _FORCEATLAS2_MIN_NODES:
+            pos = self._forceatlas2_layout(graph)
+            if pos:
+                return pos
+        return nx.spring_layout(graph, k=3, iterations=50, seed=42)
+    
+    def _layered_layout(self, graph: nx.DiGraph) -> Dict:
+        """Hierarchisches Layout: igraph (Sugiyama), sonst Graphviz (dot), sonst nach Knotentyp"""
+        if _HAS_IGRAPH:
+            pos = self._igraph_sugiyama_layout(graph)
+            if pos:
+                return pos
+        if _HAS_PYGRAPHVIZ:
+            try:
+                return nx.nx_agraph.graphviz_layout(graph, prog='dot')
+            except Exception as e:
+                print(f"⚠️ Graphviz-Layout fehlgeschlagen, verwende Typ-Ebenen: {e}")
+        return self._hierarchical_layout(graph)
+    
+    def _igraph_sugiyama_layout(self, graph: nx.DiGraph) -> Optional[Dict]:
+        """Sugiyama-Layout über igraph (C-Implementierung, deterministisch); None bei Fehler"""
+        try:
+            nodes = list(graph)
+            node_index = {node: i for i, node in enumerate(nodes)}
+            ig_graph = ig.Graph(n=len(nodes), directed=True,
+                                edges=[(node_index[u], node_index[v]) for u, v in graph.edges()])
+            # igraph zählt Ebenen nach unten, Plot-y nach oben: y spiegeln
+            coords = [(x, -y) for x, y in ig_graph.layout_sugiyama().coords[:len(nodes)]]
+            return dict(zip(nodes, coords))
+        except Exception as e:
+            print(f"⚠️ igraph-Layout fehlgeschlagen, verwende Graphviz/Typ-Ebenen: {e}")
+            return None
+    
+    def _forceatlas2_layout(self, graph: nx.DiGraph) -> Optional[Dict]:
+        """ForceAtlas2-Layout über fa2 (Cython + Barnes-Hut); None wenn nicht verfügbar"""
+        try:
+            from fa2 import ForceAtlas2
+        except ImportError:
+            print("⚠️ fa2 nicht installiert - verwende spring_layout (pip install fa2)")
+            return None
+        
+        try:
+            # Ungerichtete Adjazenzmatrix selbst bauen: fa2s forceatlas2_networkx_layout lehnt
+            # gerichtete Graphen ab (ältere fa2-Versionen nutzen zudem eine in NetworkX 3
+            # entfernte Funktion)
+            nodes = list(graph)
+            adjacency = nx.to_scipy_sparse_array(graph.to_undirected(as_view=True), nodelist=nodes,
+                                                 weight=None, format='lil')
+            forceatlas2 = ForceAtlas2(barnesHutOptimize=True, barnesHutTheta=1.2,
+                                      scalingRatio=2.0, gravity=1.0, verbose=False)
+            # Feste Startpositionen (seed=42 wie spring_layout): fa2 würfelt sonst über numpy.random
+            start = np.random.default_rng(42).random((len(nodes), 2))
+            positions = forceatlas2.forceatlas2(adjacency, pos=start, iterations=100)
+            return dict(zip(nodes, positions))
+        except Exception as e:
+            print(f"⚠️ ForceAtlas2-Layout fehlgeschlagen, verwende spring_layout: {e}")
+            return None
+    
+    def _lbfgs_layout(self, graph: nx.DiGraph, max_iterations: int = 50,
+                      gravity: float = 0.01) -> Optional[Dict]:
+        """Kräftebasiertes Layout durch direkte Energieminimierung (SciPy L-BFGS-B)
+        
+        Energie: Σ_Kanten ||x_i - x_j||² - k² Σ_Paare log ||x_i - x_j|| + gravity Σ ||x_i||²
+        (k = 1/√n wie bei spring_layout; die schwache Gravitation hält unverbundene
+        Teilgraphen zusammen). Abstoßung über alle Paare: O(n²) Speicher, gedacht für
+        mittelgroße Graphen. None wenn scipy fehlt.
+        """
+        try:
+            from scipy.optimize import minimize
+        except ImportError:
+            print("⚠️ scipy nicht installiert - verwende spring_layout (pip install scipy)")
+            return None
+        
+        nodes = list(graph)
+        n = len(nodes)
+        if n < 2:
+            return nx.circular_layout(graph)
+        
+        # Laplace-Matrix L: x^T L x = Σ_Kanten ||x_i - x_j||², Gradient 2 L x
+        laplacian = None
+        if graph.number_of_edges():
+            laplacian = nx.laplacian_matrix(graph.to_undirected(as_view=True), nodelist=nodes,
+                                            weight=None).astype(float)
+        k_squared = 1.0 / n
+        
+        def energy_and_gradient(flat: np.ndarray) -> Tuple[float, np.ndarray]:
+            positions = flat.reshape(n, 2)
+            diff = positions[:, None, :] - positions[None, :, :]
+            dist_squared = np.einsum('ijk,ijk->ij', diff, diff)
+            np.fill_diagonal(dist_squared, 1.0)
+            
+            energy = -0.25 * k_squared * np.log(dist_squared).sum()
+            gradient = -k_squared * np.einsum('ijk,ij->ik', diff, 1.0 / dist_squared)
+            if laplacian is not None:
+                attraction = laplacian @ positions
+                energy += float(np.sum(positions * attraction))
+                gradient += 2.0 * attraction
+            energy += gravity * float(np.sum(positions * positions))
+            gradient += 2.0 * gravity * positions
+            return energy, gradient.ravel()
+        
+        start = np.random.default_rng(42).random((n, 2)).ravel()
+        result = minimize(energy_and_gradient, start, jac=True, method='L-BFGS-B',
+                          options={'maxiter': max_iterations})
+        positions = nx.rescale_layout(result.x.reshape(n, 2))
+        return dict(zip(nodes, positions))
     
     def _hierarchical_layout(self, graph: nx.DiGraph) -> Dict:
         """Erstellt hierarchisches Layout basierend auf Knotentypen"""
@@ -324,29 +502,35 @@ class GraphVisualizer:
         
         return pos
     
+    def _get_groups(self, graph: nx.DiGraph) -> Tuple[Dict[str, List], Dict[str, List]]:
+        """Knoten je Typ und Kanten je Beziehung; für denselben Graph nur einmal berechnet"""
+        signature = (graph.number_of_nodes(), graph.number_of_edges())
+        cached = self._group_cache
+        if cached is not None and cached[0] is graph and cached[1] == signature:
+            return cached[2], cached[3]
+        
+        node_groups = self._group_nodes_by_type(graph)
+        edge_groups = self._group_edges_by_relationship(graph)
+        self._group_cache = (graph, signature, node_groups, edge_groups)
+        return node_groups, edge_groups
+    
     def _group_nodes_by_type(self, graph: nx.DiGraph) -> Dict[str, List]:
         """Gruppiert Knoten nach Typ"""
-        groups = {}
+        groups = defaultdict(list)
         
         for node, data in graph.nodes(data=True):
-            node_type = data.get('node_type', data.get('resource_type', 'unknown'))
-            if node_type not in groups:
-                groups[node_type] = []
-            groups[node_type].append(node)
+            groups[data.get('node_type', data.get('resource_type', 'unknown'))].append(node)
         
-        return groups
+        return dict(groups)
     
     def _group_edges_by_relationship(self, graph: nx.DiGraph) -> Dict[str, List]:
         """Gruppiert Kanten nach Beziehungstyp"""
-        groups = {}
+        groups = defaultdict(list)
         
         for source, target, data in graph.edges(data=True):
-            relationship = data.get('relationship', 'unknown')
-            if relationship not in groups:
-                groups[relationship] = []
-            groups[relationship].append((source, target))
+            groups[data.get('relationship', 'unknown')].append((source, target))
         
-        return groups
+        return dict(groups)
 
 
 def create_test_graph() -> nx.DiGraph:
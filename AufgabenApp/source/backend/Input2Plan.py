@@ -5,16 +5,42 @@ Nimmt Ziel/Projekt-Input entgegen und generiert Plan über LLM
 """
 
 import asyncio
+import hashlib
 import json
 import os
 from enum import Enum
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable
 import httpx
-import subprocess
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Optional: orjson für schnelleres Parsen/Serialisieren, sonst stdlib json
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any, indent: bool = False) -> str:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode()
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any, indent: bool = False) -> str:
+        if indent:
+            return json.dumps(obj, indent=2, ensure_ascii=False)
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+# HTTP/2 nur mit installiertem h2-Paket (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
 
 class LLMProvider(Enum):
     OLLAMA = "ollama"
@@ -22,24 +48,136 @@ class LLMProvider(Enum):
     CHATGPT = "chatgpt"
 
 
+_json_decoder = json.JSONDecoder()
+
+
+def _extract_json(content: str) -> Dict[str, Any]:
+    """Extrahiert das erste vollständige JSON-Objekt aus einer Textantwort
+    
+    raw_decode liest ab einem '{' genau ein Objekt und ignoriert nachfolgenden Text
+    (z.B. Code-Fences, Erklärungen); lässt sich dort keins lesen, ab dem nächsten '{'.
+    """
+    start = content.find('{')
+    while start != -1:
+        try:
+            return _json_decoder.raw_decode(content, start)[0]
+        except json.JSONDecodeError:
+            pass
+        start = content.find('{', start + 1)
+    raise json.JSONDecodeError("Kein JSON-Objekt in der Antwort gefunden", content, 0)
+
+
+def _claude_delta(event: Dict[str, Any]) -> str:
+    """Text-Stück aus einem Claude-Stream-Event"""
+    if event.get("type") == "content_block_delta":
+        return event.get("delta", {}).get("text", "")
+    return ""
+
+
+def _openai_delta(event: Dict[str, Any]) -> str:
+    """Text-Stück aus einem OpenAI-Stream-Event"""
+    choices = event.get("choices") or [{}]
+    return choices[0].get("delta", {}).get("content") or ""
+
+
 class LLMClient:
-    def __init__(self, provider: LLMProvider):
+    def __init__(self, provider: LLMProvider, stream: bool = False,
+                 on_delta: Optional[Callable[[str], None]] = None,
+                 cache_dir: Optional[str] = None):
         self.provider = provider
+        # Optionaler Plan-Cache auf der Platte (gleiches Ziel + Provider -> gespeicherter Plan)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        # Antworten stückweise lesen (Standard: eine Anfrage, Antwort am Stück)
+        self.stream = stream
+        # Optionaler Callback je empfangenem Text-Stück (z.B. Fortschrittsanzeige)
+        self.on_delta = on_delta
+        # Gemeinsamer HTTP-Client für alle Aufrufe (Verbindungen bleiben offen)
+        self._http: Optional[httpx.AsyncClient] = None
+        # Ergebnis der OLLAMA-Erreichbarkeitsprüfung (nur Erfolg wird gemerkt)
+        self._ollama_alive: Optional[bool] = None
+    
+    def _get_http(self) -> httpx.AsyncClient:
+        """Gepoolter HTTP-Client (bei Bedarf HTTP/2), beim ersten Aufruf erzeugt"""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                http2=_HTTP2,
+                timeout=120.0,
+                limits=httpx.Limits(max_keepalive_connections=10, max_connections=20)
+            )
+        return self._http
+    
+    async def aclose(self):
+        """Schließt die offenen HTTP-Verbindungen"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+    
+    async def __aenter__(self) -> "LLMClient":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
         
     async def generate_plan(self, goal: str) -> Dict[str, Any]:
         """Generiert einen Plan basierend auf dem Ziel"""
+        cached_plan = self._load_cached_plan(goal)
+        if cached_plan is not None:
+            return cached_plan
+        
         prompt = self._create_planning_prompt(goal)
         
         if self.provider == LLMProvider.OLLAMA:
-            return await self._call_ollama(prompt)
+            plan = await self._call_ollama(prompt)
         elif self.provider == LLMProvider.CLAUDE:
-            return await self._call_claude(prompt)
+            plan = await self._call_claude(prompt)
         elif self.provider == LLMProvider.CHATGPT:
-            return await self._call_chatgpt(prompt)
+            plan = await self._call_chatgpt(prompt)
         else:
             raise ValueError(f"Unbekannter LLM Provider: {self.provider}")
+        
+        if "error" not in plan:
+            self._store_cached_plan(goal, plan)
+        return plan
+    
+    def _plan_cache_path(self, goal: str) -> Optional[Path]:
+        """Cache-Datei für Provider + Prompt (None ohne cache_dir)
+        
+        Der Schlüssel enthält den vollständigen Prompt statt nur des Ziels: ändert sich die
+        Prompt-Vorlage, werden alte Pläne nicht mehr getroffen.
+        """
+        if self.cache_dir is None:
+            return None
+        prompt = self._create_planning_prompt(goal)
+        key = hashlib.sha256(f"{self.provider.value}\n{prompt}".encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}.json"
+    
+    def _load_cached_plan(self, goal: str) -> Optional[Dict[str, Any]]:
+        """Lädt einen gespeicherten Plan, falls vorhanden"""
+        path = self._plan_cache_path(goal)
+        if path is None or not path.exists():
+            return None
+        try:
+            plan = _json_loads(path.read_bytes())
+            print(f"💾 Plan aus Cache geladen: {path}")
+            return plan
+        except Exception as e:
+            print(f"⚠️ Plan-Cache nicht lesbar, generiere neu: {e}")
+            return None
+    
+    def _store_cached_plan(self, goal: str, plan: Dict[str, Any]):
+        """Speichert einen erfolgreich generierten Plan im Cache"""
+        path = self._plan_cache_path(goal)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(_json_dumps(plan), encoding='utf-8')
+        except Exception as e:
+            print(f"⚠️ Plan konnte nicht gecacht werden: {e}")
     
-    def _create_planning_prompt(self, goal: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _create_planning_prompt(goal: str) -> str:
         return f"""
 Erstelle einen detaillierten Projektplan für folgendes Ziel:
 "{goal}"
@@ -76,34 +214,95 @@ Denke in konkreten, umsetzbaren Schritten und berücksichtige Abhängigkeiten zw
         """Ruft lokales OLLAMA-Modell auf"""
         try:
             # Prüfe ob OLLAMA läuft
-            result = subprocess.run(['ollama', 'list'], capture_output=True, text=True)
-            if result.returncode != 0:
+            if not await self._check_ollama():
                 raise Exception("OLLAMA nicht verfügbar. Starte mit: ollama serve")
             
             # Standard-Modell: llama3.2 oder llama2
             model = "llama3.2"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "http://localhost:11434/api/generate",
-                    json={
-                        "model": model,
-                        "prompt": prompt,
-                        "stream": False,
-                        "format": "json"
-                    },
-                    timeout=120.0
-                )
+            payload = {
+                "model": model,
+                "prompt": prompt,
+                "stream": self.stream,
+                "format": "json"
+            }
+            
+            client = self._get_http()
+            if self.stream:
+                return await self._stream_ollama(client, payload)
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    return json.loads(result["response"])
-                else:
-                    raise Exception(f"OLLAMA Fehler: {response.status_code}")
+            response = await client.post(
+                "http://localhost:11434/api/generate",
+                json=payload,
+                timeout=120.0
+            )
+                
+            if response.status_code == 200:
+                result = response.json()
+                return _json_loads(result["response"])
+            else:
+                raise Exception(f"OLLAMA Fehler: {response.status_code}")
                     
         except Exception as e:
             print(f"OLLAMA Fehler: {e}")
             return {"error": str(e), "provider": "ollama"}
+    
+    async def _check_ollama(self) -> bool:
+        """Prüft per HTTP (/api/tags), ob der OLLAMA-Server läuft; Erfolg wird gemerkt"""
+        if self._ollama_alive:
+            return True
+        try:
+            response = await self._get_http().get("http://localhost:11434/api/tags", timeout=2.0)
+            self._ollama_alive = response.status_code == 200
+        except httpx.HTTPError:
+            self._ollama_alive = False
+        return self._ollama_alive
+    
+    async def _stream_ollama(self, client: httpx.AsyncClient, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Liest die OLLAMA-Antwort zeilenweise (NDJSON) und parst den Text nach dem Ende einmal"""
+        parts = []
+        async with client.stream("POST", "http://localhost:11434/api/generate",
+                                 json=payload, timeout=120.0) as response:
+            if response.status_code != 200:
+                raise Exception(f"OLLAMA Fehler: {response.status_code}")
+            
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                chunk = _json_loads(line)
+                token = chunk.get("response", "")
+                if token:
+                    parts.append(token)
+                    if self.on_delta:
+                        self.on_delta(token)
+                if chunk.get("done"):
+                    break
+        
+        return _extract_json("".join(parts))
+    
+    async def _stream_sse(self, client: httpx.AsyncClient, url: str, headers: Dict[str, str],
+                          payload: Dict[str, Any], timeout: float,
+                          extract_delta: Callable[[Dict[str, Any]], str], api_name: str) -> str:
+        """Liest eine Server-Sent-Events-Antwort und setzt den Text zusammen"""
+        parts = []
+        async with client.stream("POST", url, headers=headers, json=payload, timeout=timeout) as response:
+            if response.status_code != 200:
+                await response.aread()
+                raise Exception(f"{api_name} Fehler: {response.status_code} - {response.text}")
+            
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                token = extract_delta(_json_loads(data))
+                if token:
+                    parts.append(token)
+                    if self.on_delta:
+                        self.on_delta(token)
+        
+        return "".join(parts)
 
     async def _call_claude(self, prompt: str) -> Dict[str, Any]:
         """Ruft Claude API auf"""
@@ -111,35 +310,38 @@ Denke in konkreten, umsetzbaren Schritten und berücksichtige Abhängigkeiten zw
         if not api_key:
             return {"error": "ANTHROPIC_API_KEY nicht gesetzt", "provider": "claude"}
         
+        url = "https://api.anthropic.com/v1/messages"
+        headers = {
+            "x-api-key": api_key,
+            "anthropic-version": "2023-06-01",
+            "content-type": "application/json"
+        }
+        payload = {
+            "model": "claude-3-sonnet-20240229",
+            "max_tokens": 4000,
+            "messages": [
+                {"role": "user", "content": prompt}
+            ],
+            "stream": self.stream
+        }
+        
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers={
-                        "x-api-key": api_key,
-                        "anthropic-version": "2023-06-01",
-                        "content-type": "application/json"
-                    },
-                    json={
-                        "model": "claude-3-sonnet-20240229",
-                        "max_tokens": 4000,
-                        "messages": [
-                            {"role": "user", "content": prompt}
-                        ]
-                    },
-                    timeout=60.0
-                )
+            client = self._get_http()
+            if self.stream:
+                content = await self._stream_sse(client, url, headers, payload, 60.0,
+                                                 _claude_delta, "Claude API")
+                return _extract_json(content)
+                
+            response = await client.post(url, headers=headers, json=payload, timeout=60.0)
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    content = result["content"][0]["text"]
-                    # Extrahiere JSON aus der Antwort
-                    json_start = content.find('{')
-                    json_end = content.rfind('}') + 1
-                    return json.loads(content[json_start:json_end])
-                else:
-                    error_text = response.text
-                    raise Exception(f"Claude API Fehler: {response.status_code} - {error_text}")
+            if response.status_code == 200:
+                result = response.json()
+                content = result["content"][0]["text"]
+                # Extrahiere JSON aus der Antwort
+                return _extract_json(content)
+            else:
+                error_text = response.text
+                raise Exception(f"Claude API Fehler: {response.status_code} - {error_text}")
                     
         except Exception as e:
             print(f"Claude Fehler: {e}")
@@ -151,35 +353,38 @@ Denke in konkreten, umsetzbaren Schritten und berücksichtige Abhängigkeiten zw
         if not api_key:
             return {"error": "OPENAI_API_KEY nicht gesetzt", "provider": "chatgpt"}
         
+        url = "https://api.openai.com/v1/chat/completions"
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+        payload = {
+            "model": "gpt-4",
+            "messages": [
+                {"role": "system", "content": "Du bist ein Experte für Projektplanung. Antworte immer mit validen JSON."},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": 4000,
+            "temperature": 0.7,
+            "stream": self.stream
+        }
+        
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "gpt-4",
-                        "messages": [
-                            {"role": "system", "content": "Du bist ein Experte für Projektplanung. Antworte immer mit validen JSON."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        "max_tokens": 4000,
-                        "temperature": 0.7
-                    },
-                    timeout=60.0
-                )
+            client = self._get_http()
+            if self.stream:
+                content = await self._stream_sse(client, url, headers, payload, 60.0,
+                                                 _openai_delta, "OpenAI API")
+                return _extract_json(content)
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    content = result["choices"][0]["message"]["content"]
-                    # Extrahiere JSON aus der Antwort
-                    json_start = content.find('{')
-                    json_end = content.rfind('}') + 1
-                    return json.loads(content[json_start:json_end])
-                else:
-                    raise Exception(f"OpenAI API Fehler: {response.status_code}")
+            response = await client.post(url, headers=headers, json=payload, timeout=60.0)
+                
+            if response.status_code == 200:
+                result = response.json()
+                content = result["choices"][0]["message"]["content"]
+                # Extrahiere JSON aus der Antwort
+                return _extract_json(content)
+            else:
+                raise Exception(f"OpenAI API Fehler: {response.status_code}")
                     
         except Exception as e:
             print(f"ChatGPT Fehler: {e}")
@@ -219,12 +424,10 @@ async def main():
     provider = provider_map[choice]
     print(f"🤖 Verwende {provider.value}...")
     
-    # Plan generieren
-    client = LLMClient(provider)
-    
     try:
         print("🔄 Generiere Plan...")
-        plan = await client.generate_plan(goal)
+        async with LLMClient(provider) as client:
+            plan = await client.generate_plan(goal)
         
         if "error" in plan:
             print(f"❌ Fehler: {plan['error']}")
@@ -233,13 +436,14 @@ async def main():
         # Plan ausgeben
         print("\n📋 Generierter Plan:")
         print("=" * 50)
-        print(json.dumps(plan, indent=2, ensure_ascii=False))
+        plan_json = _json_dumps(plan, indent=True)
+        print(plan_json)
         
         # Plan in Datei speichern
         filename = f"plan_{goal.replace(' ', '_')[:20]}.json"
         
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(plan, f, indent=2, ensure_ascii=False)
+            f.write(plan_json)
         
         print(f"\n💾 Plan gespeichert in: {filename}")
         
@@ -6,6 +6,7 @@ Wandelt generierte Pläne in NetworkX-Graphen und Cypher-Statements um
 
 import json
 import uuid
+from collections import Counter
 from datetime import datetime
 from typing import Dict, Any, List, Tuple
 import networkx as nx
@@ -254,13 +255,9 @@ CREATE (a)-[:{relationship}]->(b)
         return {
             "nodes_count": self.graph.number_of_nodes(),
             "edges_count": self.graph.number_of_edges(),
-            "node_types": {
-                node_data.get("node_type", "unknown"): len([
-                    n for n, d in self.graph.nodes(data=True) 
-                    if d.get("node_type") == node_data.get("node_type")
-                ])
-                for _, node_data in self.graph.nodes(data=True)
-            },
+            "node_types": dict(Counter(
+                node_data.get("node_type", "unknown") for node_data in self.graph._node.values()
+            )),
             "nodes": [
                 {
                     "id": node_id,
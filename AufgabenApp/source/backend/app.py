@@ -19,6 +19,13 @@ import sys
 import os
 from dotenv import load_dotenv
 
+# Optional: orjson für Antworten mit Graph-Daten (deutlich schneller als json.dumps)
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as GraphJSONResponse
+except ImportError:
+    GraphJSONResponse = JSONResponse
+
 # Konfiguration laden  
 config_path = Path(__file__).parent.parent.parent / "config" / "app_config.env"
 config_path = config_path.resolve()  # Absoluter Pfad
@@ -58,6 +65,7 @@ app.add_middleware(
 # Globale Manager-Instanzen
 version_manager = GraphVersionManager()
 neo4j_manager = Neo4jManager()
+llm_clients: Dict[LLMProvider, LLMClient] = {}  # je Provider ein Client (Verbindungs-Pool)
 active_connections: Dict[str, WebSocket] = {}
 
 # Frontend Pfad definieren
@@ -80,6 +88,8 @@ async def shutdown_event():
     """Server-Shutdown Event"""
     print("🛑 Server wird heruntergefahren...")
     await neo4j_manager.close()
+    for llm_client in llm_clients.values():
+        await llm_client.aclose()
 
 # WebSocket Connection Manager
 class ConnectionManager:
@@ -98,11 +108,13 @@ class ConnectionManager:
 
     async def send_personal_message(self, message: dict, client_id: str):
         if client_id in self.active_connections:
-            await self.active_connections[client_id].send_text(json.dumps(message))
+            await self.active_connections[client_id].send_text(json.dumps(message, separators=(',', ':')))
 
     async def broadcast(self, message: dict):
+        # Einmal serialisieren, nicht pro Verbindung
+        text = json.dumps(message, separators=(',', ':'))
         for connection in self.active_connections.values():
-            await connection.send_text(json.dumps(message))
+            await connection.send_text(text)
 
 manager = ConnectionManager()
 
@@ -147,7 +159,10 @@ async def generate_plan(
         else:
             raise HTTPException(status_code=400, detail=f"Unbekannter LLM Provider: {provider}")
         
-        llm_client = LLMClient(llm_provider)
+        llm_client = llm_clients.get(llm_provider)
+        if llm_client is None:
+            # Streaming: Antwort kommt stückweise, lange Generierungen laufen nicht in den Timeout
+            llm_client = llm_clients[llm_provider] = LLMClient(llm_provider, stream=True)
         
         print(f"🤖 Generiere Plan für: '{goal}' mit {provider}")
         
@@ -185,7 +200,7 @@ async def generate_plan(
         visualizer = CytoscapeVisualizer()
         cytoscape_elements = visualizer.networkx_to_cytoscape(graph)
         
-        return JSONResponse({
+        return GraphJSONResponse({
             "success": True,
             "graph_id": graph_id,
             "version": 1,
@@ -273,9 +288,9 @@ async def get_graph(graph_id: str, version: Optional[int] = None):
         
         # GraphVersion-Objekt zu dict konvertieren
         if hasattr(graph_info, 'to_dict'):
-            return JSONResponse(graph_info.to_dict())
+            return GraphJSONResponse(graph_info.to_dict())
         else:
-            return JSONResponse(graph_info)
+            return GraphJSONResponse(graph_info)
         
     except Exception as e:
         print(f"❌ Fehler beim Laden des Graphs: {e}")
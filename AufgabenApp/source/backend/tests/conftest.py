@@ -0,0 +1,6 @@
+"""Gemeinsame pytest-Konfiguration: Backend-Module wie im Server direkt importierbar machen"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
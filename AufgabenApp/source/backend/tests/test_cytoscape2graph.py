@@ -0,0 +1,193 @@
+"""Tests für Cytoscape2Graph: Cypher-Erzeugung und parallele Neo4j-Ingestion"""
+
+import random
+import threading
+import time
+from itertools import combinations
+
+import pytest
+
+from Cytoscape2Graph import Cytoscape2GraphConverter, _edge_rounds
+
+
+def _elements(n_nodes=40, n_edges=120, seed=1):
+    rng = random.Random(seed)
+    elements = [{"data": {"id": f"n{i}", "label": f"Knoten {i}", "type": "task"}}
+                for i in range(n_nodes)]
+    pairs = set()
+    while len(pairs) < n_edges:
+        a, b = rng.randrange(n_nodes), rng.randrange(n_nodes)
+        if a != b:
+            pairs.add((a, b))
+    elements += [{"data": {"id": f"n{a}-n{b}", "source": f"n{a}", "target": f"n{b}",
+                           "relationship": rng.choice(["REQUIRES", "PRECEDES"])}}
+                 for a, b in sorted(pairs)]
+    return elements
+
+
+def _edge_rows(n_nodes=40, n_edges=120):
+    converter = Cytoscape2GraphConverter()
+    converter.load_cytoscape_json(_elements(n_nodes, n_edges))
+    return converter._collect_cypher_rows()[1]
+
+
+@pytest.mark.parametrize("num_threads", [1, 2, 3, 8])
+def test_edge_rounds_cover_every_edge_once(num_threads):
+    edge_rows = _edge_rows()
+    rounds = _edge_rounds(edge_rows, num_threads, batch_size=7)
+    
+    scheduled = [(row['src'], row['tgt']) for jobs in rounds for job in jobs
+                 for _, rows in job for row in rows]
+    expected = [(row['src'], row['tgt']) for rows in edge_rows.values() for row in rows]
+    assert sorted(scheduled) == sorted(expected)
+    assert all(len(rows) <= 7 for jobs in rounds for job in jobs for _, rows in job)
+
+
+@pytest.mark.parametrize("num_threads", [1, 2, 3, 8])
+def test_edge_rounds_jobs_touch_disjoint_nodes(num_threads):
+    rounds = _edge_rounds(_edge_rows(), num_threads, batch_size=5)
+    
+    for jobs in rounds:
+        assert len(jobs) <= 2 * num_threads
+        node_sets = [{node for _, rows in job for row in rows for node in (row['src'], row['tgt'])}
+                     for job in jobs]
+        for first, second in combinations(node_sets, 2):
+            assert not first & second
+
+
+def test_edge_rounds_empty():
+    assert _edge_rounds({}, 4, batch_size=10) == []
+
+
+class _FakeDriver:
+    """Neo4j-Driver-Attrappe: meldet gleichzeitige Sperren desselben Knotens"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.active = set()
+        self.conflicts = []
+        self.rows = 0
+    
+    def session(self):
+        return _FakeSession(self)
+
+
+class _FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def run(self, cypher, rows):
+        driver = self.driver
+        nodes = {node for row in rows for node in (row.get('src'), row.get('tgt')) if node}
+        with driver._lock:
+            if driver.active & nodes:
+                driver.conflicts.append(driver.active & nodes)
+            driver.active |= nodes
+            driver.rows += len(rows)
+        time.sleep(0.001)
+        with driver._lock:
+            driver.active -= nodes
+        return self
+    
+    def consume(self):
+        return None
+
+
+def test_ingest_parallel_writes_all_rows_without_shared_nodes():
+    pytest.importorskip("neo4j")
+    converter = Cytoscape2GraphConverter()
+    converter.load_cytoscape_json(_elements())
+    driver = _FakeDriver()
+    
+    written = converter.ingest_parallel(driver, num_threads=4, batch_size=10)
+    
+    assert written == driver.rows == 40 + 120
+    assert driver.conflicts == []
+
+
+@pytest.mark.parametrize("kwargs", [{"num_threads": 0}, {"batch_size": 0}])
+def test_ingest_parallel_rejects_invalid_arguments(kwargs):
+    converter = Cytoscape2GraphConverter()
+    converter.load_cytoscape_json(_elements())
+    with pytest.raises(ValueError):
+        converter.ingest_parallel(_FakeDriver(), **kwargs)
+
+
+_MIXED_ELEMENTS = [
+    {"data": {"id": "ziel", "label": 'Ziel "A"\nmit Umbruch', "type": "objective", "estimated_hours": 3}},
+    {"data": {"id": "task1", "label": "Aufgabe", "type": "task", "status": "done", "estimated_hours": 2.5}},
+    {"data": {"id": "dev", "label": "Entwickler", "type": "actor"}},
+    {"data": {"id": "ziel-task1", "source": "ziel", "target": "task1", "relationship": "contains"}},
+    {"data": {"id": "task1-dev", "source": "task1", "target": "dev", "relationship": "REQUIRES", "weight": 2}},
+]
+
+
+def _converted(method, *args):
+    converter = Cytoscape2GraphConverter()
+    converter.load_cytoscape_json(_MIXED_ELEMENTS)
+    return getattr(converter, method)(*args)
+
+
+def test_batched_matches_parameterized_statements():
+    batched = _converted("cytoscape_to_cypher_batched", 1)
+    parameterized = _converted("cytoscape_to_cypher_parameterized")
+    assert len(batched) == len(parameterized) == 5
+    
+    for (batch_cypher, rows), (cypher, params) in zip(batched, parameterized):
+        assert len(rows) == 1
+        row = rows[0]
+        if 'props' in params and 'id' in params:
+            # Knoten: gleiches Label, Zeile = id + Eigenschaften
+            assert batch_cypher.split('CREATE (n:')[1].split(')')[0] == cypher.split('MERGE (n:')[1].split(' ')[0]
+            assert row == {'id': params['id'], **params['props']}
+        else:
+            assert batch_cypher.split('[r:')[1].split(']')[0] == cypher.split('[r:')[1].split(']')[0]
+            assert (row['src'], row['tgt'], row['props']) == (params['source'], params['target'], params['props'])
+
+
+def test_batched_matches_per_statement_cypher():
+    batched = _converted("cytoscape_to_cypher_batched", 1)
+    statements = _converted("cytoscape_to_cypher")
+    assert len(statements) == len(batched)
+    
+    for statement, (batch_cypher, [row]) in zip(statements, batched):
+        if statement.startswith('CREATE'):
+            label = batch_cypher.split('CREATE (n:')[1].split(')')[0]
+            assert statement.startswith(f'CREATE (n:{label} {{')
+            for key, value in row.items():
+                if key == 'id':
+                    continue
+                if isinstance(value, str):
+                    escaped = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+                    assert f'{key}: "{escaped}"' in statement
+                else:
+                    assert f'{key}: {value}' in statement
+        else:
+            relationship = batch_cypher.split('[r:')[1].split(']')[0]
+            assert f'WHERE a.id = "{row["src"]}" AND b.id = "{row["tgt"]}"' in statement
+            assert f'CREATE (a)-[:{relationship}' in statement
+            for key, value in row['props'].items():
+                assert f'{key}: {value}' in statement
+
+
+def test_batched_splits_rows_by_batch_size():
+    batched = _converted("cytoscape_to_cypher_batched", 2)
+    node_rows = [row for cypher, rows in batched if 'CREATE (n:' in cypher for row in rows]
+    assert sorted(row['id'] for row in node_rows) == ['dev', 'task1', 'ziel']
+    assert all(len(rows) <= 2 for _, rows in batched)
+
+
+@pytest.mark.parametrize("node_data, expected", [
+    ({'node_type': 'task', 'name': 'A "q" \\ x\n{y}', 'estimated_hours': 3, 'cost': 1.5, 'x': 1, 'note': None},
+     'CREATE (n:TASK {name: "A \\"q\\" \\\\ x\\n{y}", estimated_hours: 3, cost: 1.5})'),
+    ({'node_type': 'actor', 'we{ird}': 'v'}, 'CREATE (n:RESOURCE:ACTOR {we{ird}: "v"})'),
+    ({'node_type': 'objective'}, 'CREATE (n:OBJECTIVE {})'),
+])
+def test_node_cypher_template(node_data, expected):
+    assert Cytoscape2GraphConverter()._create_node_cypher('n1', node_data) == expected
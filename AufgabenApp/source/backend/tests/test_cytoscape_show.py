@@ -0,0 +1,130 @@
+"""Tests für CytoscapeShow: Elementformate, JSON-Export und hierarchisches Layout"""
+
+import json
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+import networkx as nx
+import pytest
+
+from CytoscapeShow import CytoscapeVisualizer, _layered_positions
+from Cytoscape2Graph import Cytoscape2GraphConverter
+
+_TEMPLATE = Path(__file__).resolve().parent.parent / "templates" / "cytoscape.html"
+
+
+@pytest.fixture
+def graph():
+    g = nx.DiGraph()
+    g.add_node("ziel", name="Projektziel", node_type="objective", description="Ziel <b>", estimated_hours=8.0)
+    g.add_node("projekt", name="Projekt", node_type="project", status="pending")
+    g.add_node("task1", name='Aufgabe "1"', node_type="task", status="done", estimated_hours=2.5)
+    g.add_node("task2", name="Aufgabe 2", node_type="task", status="in_progress")
+    g.add_node("node_7", resource_type="actor")
+    g.add_edge("ziel", "projekt", relationship="CONTAINS")
+    g.add_edge("projekt", "task1", relationship="CONTAINS")
+    g.add_edge("projekt", "task2", relationship="CONTAINS")
+    g.add_edge("task1", "task2", relationship="PRECEDES")
+    g.add_edge("task1", "node_7", relationship="REQUIRES")
+    return g
+
+
+def _expand(payload):
+    """Python-Gegenstück zu expandElements im HTML-Template (ohne Darstellungsfelder)"""
+    nodes, edges = payload["nodes"], payload["edges"]
+    ids = nodes["id"]
+    elements = []
+    for i, node_id in enumerate(ids):
+        label = nodes["label"][i]
+        data = {"id": node_id, "label": node_id if label is None else label,
+                "type": payload["types"][nodes["type"][i]]}
+        for column in ("description", "estimated_hours"):
+            if column in nodes and nodes[column][i] is not None:
+                data[column] = nodes[column][i]
+        if "status" in nodes and nodes["status"][i] is not None:
+            data["status"] = payload["statuses"][nodes["status"][i]]
+        elements.append({"group": "nodes", "data": data})
+    for source, target, relationship in zip(edges["source"], edges["target"], edges["relationship"]):
+        elements.append({"group": "edges", "data": {
+            "id": f"{ids[source]}-{ids[target]}", "source": ids[source], "target": ids[target],
+            "relationship": payload["relationships"][relationship]}})
+    return elements
+
+
+def test_columnar_expands_to_element_list(graph):
+    visualizer = CytoscapeVisualizer()
+    payload = visualizer.networkx_to_cytoscape_columnar(graph)
+
+    assert _expand(payload) == visualizer.networkx_to_cytoscape(graph)
+    assert payload["statuses"] == ["done", "in_progress"]
+    assert payload["next_node_id"] == 8
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node nicht installiert")
+def test_columnar_expands_in_browser_code(graph):
+    """Führt das echte expandElements aus dem Template aus (Darstellung per Stub neutral)"""
+    visualizer = CytoscapeVisualizer()
+    positions = {node: (index * 10, index * 20) for index, node in enumerate(graph)}
+    payload = visualizer.networkx_to_cytoscape_columnar(graph, positions=positions)
+
+    template = _TEMPLATE.read_text(encoding="utf-8")
+    function = re.search(r"^( *)function expandElements\(payload\) \{.*?^\1\}$", template,
+                         re.S | re.M).group(0)
+    script = "\n".join([
+        "var nextNodeId = 1, typeStyles = {node: {}, edge: {}};",
+        "function reserveNodeId(id) {}",
+        "function applyNodeVisual(data) { return data; }",
+        "function applyEdgeVisual(data) { return data; }",
+        function,
+        f"process.stdout.write(JSON.stringify({{elements: expandElements({json.dumps(payload)}),"
+        " nextNodeId: nextNodeId}));",
+    ])
+    result = json.loads(subprocess.run(["node", "-e", script], capture_output=True, text=True,
+                                       check=True).stdout)
+
+    expected = visualizer.networkx_to_cytoscape(graph)
+    for element in expected[:graph.number_of_nodes()]:
+        x, y = positions[element["data"]["id"]]
+        element["position"] = {"x": x, "y": y}
+    assert result["elements"] == expected
+    assert result["nextNodeId"] == 8
+
+
+def test_json_export_roundtrip(graph, tmp_path):
+    output_file = CytoscapeVisualizer().export_cytoscape_json(graph, str(tmp_path / "graph.json"))
+
+    converter = Cytoscape2GraphConverter()
+    assert converter.load_cytoscape_json(output_file)
+    restored = converter.cytoscape_to_networkx()
+
+    assert set(restored.nodes) == set(graph.nodes)
+    assert set(restored.edges) == set(graph.edges)
+    for node, data in graph.nodes(data=True):
+        restored_data = restored.nodes[node]
+        assert restored_data["name"] == data.get("name", node)
+        assert restored_data["node_type"] == data.get("node_type", data.get("resource_type"))
+        assert restored_data["status"] == data.get("status", "pending")
+        assert restored_data["estimated_hours"] == data.get("estimated_hours", 0)
+    for source, target, data in graph.edges(data=True):
+        assert restored.edges[source, target]["relationship"] == data["relationship"]
+
+
+def test_layered_positions_point_edges_downwards(graph):
+    positions = _layered_positions(graph)
+
+    assert set(positions) == set(graph.nodes)
+    for source, target in graph.edges:
+        assert positions[source][1] < positions[target][1]
+    assert len(set(positions.values())) == graph.number_of_nodes()
+
+
+def test_layered_positions_with_cycle():
+    g = nx.DiGraph([("a", "b"), ("b", "c"), ("c", "b"), ("c", "d")])
+    positions = _layered_positions(g, layer_spacing=10, node_spacing=5)
+
+    # Zyklus b <-> c bildet eine Ebene
+    assert positions["b"][1] == positions["c"][1] == 10
+    assert positions["a"][1] == 0 and positions["d"][1] == 20
+    assert positions["b"][0] != positions["c"][0]
@@ -0,0 +1,127 @@
+"""Tests für GraphShow: Layout-Cache und reproduzierbare Layouts"""
+
+import networkx as nx
+import pytest
+
+pytest.importorskip("matplotlib")
+GraphShow = pytest.importorskip("GraphShow")
+GraphVisualizer = GraphShow.GraphVisualizer
+
+
+@pytest.fixture
+def graph():
+    return nx.gnp_random_graph(30, 0.1, seed=1, directed=True)
+
+
+@pytest.fixture
+def counting(monkeypatch):
+    """Zählt die tatsächlichen Layout-Berechnungen"""
+    calls = []
+    compute = GraphVisualizer._compute_layout
+
+    def counted(self, graph, layout):
+        calls.append(layout)
+        return compute(self, graph, layout)
+
+    monkeypatch.setattr(GraphVisualizer, "_compute_layout", counted)
+    return calls
+
+
+def test_layout_is_cached_per_graph_and_layout(graph, counting):
+    visualizer = GraphVisualizer()
+    first = visualizer._get_layout(graph, "spring")
+    assert visualizer._get_layout(graph, "spring") == first
+    visualizer._get_layout(graph, "circular")
+    assert counting == ["spring", "circular"]
+
+    # Gleicher Inhalt, anderes Objekt: Treffer über den Fingerabdruck
+    assert visualizer._get_layout(graph.copy(), "spring") == first
+    assert counting == ["spring", "circular"]
+
+
+def test_cached_layout_cannot_be_corrupted_by_callers(graph):
+    visualizer = GraphVisualizer()
+    pos = visualizer._get_layout(graph, "spring")
+    expected = dict(pos)
+
+    pos[0] = (99.0, 99.0)
+    x, y = pos[1]
+    pos[1] = (x + 5, y)
+    del pos[2]
+
+    assert visualizer._get_layout(graph, "spring") == expected
+
+
+def test_layout_key_follows_edges_and_node_types(graph, counting):
+    visualizer = GraphVisualizer()
+    visualizer._get_layout(graph, "spring")
+
+    changed = graph.copy()
+    changed.add_edge(0, 29)
+    visualizer._get_layout(changed, "spring")
+    assert counting == ["spring", "spring"]
+
+    typed = graph.copy()
+    nx.set_node_attributes(typed, "task", "node_type")
+    visualizer._get_layout(typed, "hierarchical")
+    retyped = typed.copy()
+    retyped.nodes[0]["node_type"] = "objective"
+    visualizer._get_layout(retyped, "hierarchical")
+    assert counting == ["spring", "spring", "hierarchical", "hierarchical"]
+
+
+def test_in_place_edit_needs_invalidate(counting):
+    graph = nx.DiGraph([(0, 1), (1, 2)])
+    visualizer = GraphVisualizer()
+    visualizer._get_layout(graph, "spring")
+
+    # Kante tauschen: Anzahlen bleiben gleich, der letzte Schlüssel gilt weiter
+    graph.remove_edge(1, 2)
+    graph.add_edge(2, 0)
+    visualizer._get_layout(graph, "spring")
+    assert counting == ["spring"]
+
+    visualizer.invalidate_layout()
+    visualizer._get_layout(graph, "spring")
+    assert counting == ["spring", "spring"]
+
+
+def test_layout_cache_is_bounded(graph):
+    visualizer = GraphVisualizer()
+    for extra in range(GraphShow._LAYOUT_CACHE_SIZE + 3):
+        g = graph.copy()
+        g.add_node(100 + extra)
+        visualizer._get_layout(g, "circular")
+    assert len(visualizer._layout_cache) == GraphShow._LAYOUT_CACHE_SIZE
+
+
+def test_spring_layout_is_reproducible(graph):
+    assert GraphVisualizer()._get_layout(graph, "spring") == GraphVisualizer()._get_layout(graph, "spring")
+
+
+def test_forceatlas2_layout_is_reproducible():
+    pytest.importorskip("fa2")
+    pytest.importorskip("scipy")
+    large = nx.gnp_random_graph(GraphShow._FORCEATLAS2_MIN_NODES + 50, 0.01, seed=2, directed=True)
+
+    first = GraphVisualizer()._forceatlas2_layout(large)
+    assert first is not None
+    assert GraphVisualizer()._forceatlas2_layout(large) == first
+
+
+@pytest.mark.parametrize("use_igraph", [True, False])
+def test_hierarchical_layout_puts_parents_above_children(monkeypatch, use_igraph):
+    if use_igraph and not GraphShow._HAS_IGRAPH:
+        pytest.skip("igraph nicht installiert")
+    monkeypatch.setattr(GraphShow, "_HAS_IGRAPH", use_igraph)
+    monkeypatch.setattr(GraphShow, "_HAS_PYGRAPHVIZ", False)
+    tree = nx.DiGraph([("ziel", "projekt"), ("projekt", "task1"), ("projekt", "task2")])
+    nx.set_node_attributes(tree, {"ziel": "objective", "projekt": "project",
+                                  "task1": "task", "task2": "task"}, "node_type")
+
+    pos = GraphVisualizer()._get_layout(tree, "hierarchical")
+
+    for parent, child in tree.edges:
+        assert pos[parent][1] > pos[child][1]
+    assert pos["task1"] != pos["task2"]
+    assert GraphVisualizer()._get_layout(tree, "hierarchical") == pos
@@ -0,0 +1,95 @@
+"""Tests für Input2Plan: JSON-Extraktion aus LLM-Antworten und Plan-Cache"""
+
+import asyncio
+import json
+
+import pytest
+
+import Input2Plan
+from Input2Plan import LLMClient, LLMProvider, _extract_json
+
+PLAN = {"objective": "Website", "projects": [{"name": "P", "description": "{x}", "tasks": []}]}
+PLAN_TEXT = json.dumps(PLAN, ensure_ascii=False)
+
+
+@pytest.mark.parametrize("content", [
+    PLAN_TEXT,
+    f"```json\n{PLAN_TEXT}\n```",
+    f"Hier ist der Plan:\n{PLAN_TEXT}\nViel Erfolg!",
+    f"Hinweis {{ohne JSON}} vorab.\n```json\n{PLAN_TEXT}\n```",
+])
+def test_extract_json_finds_the_plan(content):
+    assert _extract_json(content) == PLAN
+
+
+def test_extract_json_returns_first_of_several_objects():
+    assert _extract_json(f'{PLAN_TEXT}\n{{"zweites": true}}') == PLAN
+    assert _extract_json(f'{{"erstes": 1}} {PLAN_TEXT}') == {"erstes": 1}
+
+
+@pytest.mark.parametrize("content", ["", "kein JSON", '{"abgebrochen": [1, 2'])
+def test_extract_json_raises_without_object(content):
+    with pytest.raises(json.JSONDecodeError):
+        _extract_json(content)
+
+
+class _CountingClient(LLMClient):
+    """LLMClient mit festem Ergebnis statt HTTP-Aufruf"""
+
+    def __init__(self, *args, result=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.result = PLAN if result is None else result
+        self.calls = 0
+
+    async def _call_ollama(self, prompt):
+        self.calls += 1
+        return self.result
+
+
+def test_plan_cache_reuses_stored_plan(tmp_path):
+    client = _CountingClient(LLMProvider.OLLAMA, cache_dir=str(tmp_path))
+
+    assert asyncio.run(client.generate_plan("Website")) == PLAN
+    assert asyncio.run(client.generate_plan("Website")) == PLAN
+    assert client.calls == 1
+
+    # Neuer Client, gleiches Verzeichnis: Plan kommt von der Platte
+    other = _CountingClient(LLMProvider.OLLAMA, cache_dir=str(tmp_path))
+    assert asyncio.run(other.generate_plan("Website")) == PLAN
+    assert other.calls == 0
+
+
+def test_plan_cache_key_depends_on_provider_goal_and_prompt(tmp_path, monkeypatch):
+    ollama = LLMClient(LLMProvider.OLLAMA, cache_dir=str(tmp_path))
+    claude = LLMClient(LLMProvider.CLAUDE, cache_dir=str(tmp_path))
+    path = ollama._plan_cache_path("Website")
+
+    assert path.parent == tmp_path
+    assert path != claude._plan_cache_path("Website")
+    assert path != ollama._plan_cache_path("Webseite")
+    assert path == LLMClient(LLMProvider.OLLAMA, cache_dir=str(tmp_path))._plan_cache_path("Website")
+
+    # Geänderte Prompt-Vorlage trifft alte Einträge nicht mehr
+    monkeypatch.setattr(LLMClient, "_create_planning_prompt", staticmethod(lambda goal: f"Neu: {goal}"))
+    assert ollama._plan_cache_path("Website") != path
+
+
+def test_plan_cache_skips_errors_and_unreadable_files(tmp_path):
+    failing = _CountingClient(LLMProvider.OLLAMA, cache_dir=str(tmp_path),
+                              result={"error": "offline", "provider": "ollama"})
+    asyncio.run(failing.generate_plan("Website"))
+    assert list(tmp_path.iterdir()) == []
+
+    client = _CountingClient(LLMProvider.OLLAMA, cache_dir=str(tmp_path))
+    client._plan_cache_path("Website").write_text("{kaputt", encoding="utf-8")
+    assert asyncio.run(client.generate_plan("Website")) == PLAN
+    assert client.calls == 1
+    assert Input2Plan._json_loads(client._plan_cache_path("Website").read_bytes()) == PLAN
+
+
+def test_plan_cache_disabled_without_cache_dir():
+    client = _CountingClient(LLMProvider.OLLAMA)
+    asyncio.run(client.generate_plan("Website"))
+    asyncio.run(client.generate_plan("Website"))
+    assert client.calls == 2
+    assert client._plan_cache_path("Website") is None
@@ -3,6 +3,25 @@
  * Verwaltet WebSocket-Verbindung, API-Calls und Cytoscape.js Integration
  */
 
+// Darstellung je Knotentyp/Beziehung; wird beim Laden in die Element-Daten übernommen,
+// damit das Stylesheet mit je einem Selektor für Knoten und Kanten auskommt
+const NODE_VISUALS = {
+    objective: { bg_color: '#FF6B6B', size: 80 },
+    project: { bg_color: '#4ECDC4', size: 70 },
+    task: { bg_color: '#45B7D1', size: 60 },
+    actor: { bg_color: '#96CEB4', size: 50 },
+    object: { bg_color: '#FFEAA7', size: 50 },
+    knowledge: { bg_color: '#DDA0DD', size: 50 },
+    budget: { bg_color: '#F39C12', size: 50 }
+};
+const DEFAULT_NODE_VISUAL = { bg_color: '#4ECDC4', size: 60 };
+const EDGE_COLORS = {
+    CONTAINS: '#2C3E50',
+    REQUIRES: '#E74C3C',
+    PRECEDES: '#9B59B6'
+};
+const DEFAULT_EDGE_COLOR = '#ccc';
+
 class PlanningInterface {
     constructor() {
         this.apiBaseUrl = 'http://localhost:8000/api';
@@ -198,7 +217,12 @@ class PlanningInterface {
             boxSelectionEnabled: true,
             selectionType: 'single',
             autoungrabify: false,
-            autounselectify: false
+            autounselectify: false,
+
+            // Rendering beim Verschieben/Zoomen (große Graphen)
+            textureOnViewport: true,
+            hideEdgesOnViewport: true,
+            hideLabelsOnViewport: true
         });
 
         // Event Listeners für Cytoscape
@@ -263,99 +287,22 @@ class PlanningInterface {
                     'text-wrap': 'wrap',
                     'text-max-width': '80px',
                     'shape': 'ellipse',
-                    'width': '60px',
-                    'height': '60px',
-                    'background-color': '#4ECDC4'
-                }
-            },
-            {
-                selector: 'node[type="objective"]',
-                style: {
-                    'background-color': '#FF6B6B',
-                    'width': '80px',
-                    'height': '80px'
-                }
-            },
-            {
-                selector: 'node[type="project"]',
-                style: {
-                    'background-color': '#4ECDC4',
-                    'width': '70px',
-                    'height': '70px'
-                }
-            },
-            {
-                selector: 'node[type="task"]',
-                style: {
-                    'background-color': '#45B7D1',
-                    'width': '60px',
-                    'height': '60px'
-                }
-            },
-            {
-                selector: 'node[type="actor"]',
-                style: {
-                    'background-color': '#96CEB4',
-                    'width': '50px',
-                    'height': '50px'
-                }
-            },
-            {
-                selector: 'node[type="object"]',
-                style: {
-                    'background-color': '#FFEAA7',
-                    'width': '50px',
-                    'height': '50px'
-                }
-            },
-            {
-                selector: 'node[type="knowledge"]',
-                style: {
-                    'background-color': '#DDA0DD',
-                    'width': '50px',
-                    'height': '50px'
-                }
-            },
-            {
-                selector: 'node[type="budget"]',
-                style: {
-                    'background-color': '#F39C12',
-                    'width': '50px',
-                    'height': '50px'
+                    'width': 'data(size)',
+                    'height': 'data(size)',
+                    'background-color': 'data(bg_color)'
                 }
             },
             {
                 selector: 'edge',
                 style: {
                     'width': 3,
-                    'line-color': '#ccc',
-                    'target-arrow-color': '#ccc',
+                    'line-color': 'data(line_color)',
+                    'target-arrow-color': 'data(line_color)',
                     'target-arrow-shape': 'triangle',
                     'curve-style': 'bezier',
                     'arrow-scale': 1.5
                 }
             },
-            {
-                selector: 'edge[relationship="CONTAINS"]',
-                style: {
-                    'line-color': '#2C3E50',
-                    'target-arrow-color': '#2C3E50'
-                }
-            },
-            {
-                selector: 'edge[relationship="REQUIRES"]',
-                style: {
-                    'line-color': '#E74C3C',
-                    'target-arrow-color': '#E74C3C'
-                }
-            },
-            {
-                selector: 'edge[relationship="PRECEDES"]',
-                style: {
-                    'line-color': '#9B59B6',
-                    'target-arrow-color': '#9B59B6'
-                }
-            },
             {
                 selector: ':selected',
                 style: {
@@ -427,6 +374,9 @@ class PlanningInterface {
     loadGraphData(cytoscapeElements, versionInfo = null) {
         console.log(`🔄 Lade Graph mit ${cytoscapeElements.length} Elementen`);
         
+        // Darstellungsattribute aus Typ/Beziehung ableiten
+        cytoscapeElements.forEach(element => this.applyVisualData(element.data));
+        
         // Elements in Cytoscape laden
         this.cytoscapeInstance.elements().remove();
         this.cytoscapeInstance.add(cytoscapeElements);
@@ -446,6 +396,16 @@ class PlanningInterface {
         console.log('✅ Graph geladen');
     }
 
+    applyVisualData(data) {
+        if (data.source) {
+            data.line_color = EDGE_COLORS[data.relationship] || DEFAULT_EDGE_COLOR;
+        } else {
+            const visual = NODE_VISUALS[data.type] || DEFAULT_NODE_VISUAL;
+            data.bg_color = visual.bg_color;
+            data.size = visual.size;
+        }
+    }
+
     updateGraphInfo(elements, versionInfo) {
         const nodes = elements.filter(el => !el.data.source);
         const edges = elements.filter(el => el.data.source);